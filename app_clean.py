@@ -5,12 +5,22 @@
 # Seven Stakeholder / ESG narrative, LIP Console, and LIP Assistant (beta).
 
 from __future__ import annotations
-import io, os, tempfile, re, csv, datetime
+import io, os, tempfile, re, csv, hashlib, posixpath, datetime, zipfile
 from pathlib import Path
-from typing import Dict, Any, List, Tuple, Optional
+from xml.etree import ElementTree as ET
+from itertools import islice
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple, Optional, FrozenSet, BinaryIO
+from dataclasses import dataclass
 
 import streamlit as st
-import plotly.graph_objects as go  # for radar charts
+
+try:
+    # Lets worker threads use st.cache_data without "missing ScriptRunContext" noise
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except Exception:
+    add_script_run_ctx = get_script_run_ctx = None
 
 # -------------------- PROJECT LOGOS -----------------
 IMPACT3T_LOGO_PATH = "demo_assets/impact3t_logo.png"
@@ -26,19 +36,35 @@ PUBLIC_MODE: bool = (APP_MODE == "PUBLIC")
 REQUIRE_PASS: bool = (APP_MODE == "PRIVATE")
 
 # ---------------- DOCX/PPTX optional ----------------
-HAVE_DOCX = False
-HAVE_PPTX = False
-try:
-    from docx import Document  # type: ignore
-    HAVE_DOCX = True
-except Exception:
-    HAVE_DOCX = False
+# python-docx / python-pptx take ~190 ms and ~17 MB to import and are only needed for
+# DOCX export and the fallback readers, so each is imported on first use
+@st.cache_resource(show_spinner=False)
+def _lazy_docx() -> Tuple[Any, Any]:
+    """(Document, qn) from python-docx, or (None, None) if it is not installed."""
+    try:
+        from docx import Document  # type: ignore
+        from docx.oxml.ns import qn  # type: ignore
+    except Exception:
+        return None, None
+    return Document, qn
+
 
+@st.cache_resource(show_spinner=False)
+def _lazy_pptx() -> Any:
+    """python-pptx's Presentation, or None if it is not installed."""
+    try:
+        from pptx import Presentation  # type: ignore
+    except Exception:
+        return None
+    return Presentation
+
+# pyahocorasick: single-pass multi-cue scan (falls back to per-cue search)
+HAVE_AHOCORASICK = False
 try:
-    from pptx import Presentation  # type: ignore
-    HAVE_PPTX = True
+    import ahocorasick  # type: ignore
+    HAVE_AHOCORASICK = True
 except Exception:
-    HAVE_PPTX = False
+    HAVE_AHOCORASICK = False
 
 # ------------------ THEME ----------------------------
 # IMPAC3T-IP inspired palette (no yellow / gold)
@@ -296,13 +322,30 @@ def _ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 
+# Anything but letters/digits (any script), space, underscore, dot or hyphen.
+# \w is exactly str.isalnum() plus "_", so non-ASCII names keep their letters.
+SAFE_NAME_RE = re.compile(r"[^\w .-]")
+
+
 def _safe(name: str) -> str:
-    return "".join(c for c in (name or "").strip() if c.isalnum() or c in (" ", "_", "-", ".")).strip().replace(" ", "_")
+    return SAFE_NAME_RE.sub("", (name or "").strip()).strip().replace(" ", "_")
 
 
+@st.cache_data(show_spinner=False)
+def _case_folder(case_name: str) -> Path:
+    """
+    Per-case export folder under OUT_ROOT. Only computes the path; writers
+    create the folder themselves right before saving.
+    """
+    return OUT_ROOT / _safe(case_name)
+
+
+# DOCX assembly is deterministic for a given (title, body); repeat clicks reuse the bytes
+@st.cache_data(max_entries=8, show_spinner=False)
 def _export_bytes(title: str, body: str) -> Tuple[bytes, str, str]:
     base = _safe(title) or "ICLicAI_Report"
-    if HAVE_DOCX:
+    Document, _ = _lazy_docx()
+    if Document is not None:
         doc = Document()
         if not PUBLIC_MODE:
             doc.add_paragraph().add_run("CONFIDENTIAL — Internal Evaluation Draft (No Distribution)").bold = True
@@ -332,6 +375,18 @@ def _save_bytes(folder: Path, name: str, data: bytes) -> Tuple[Optional[Path], s
     except Exception as e:
         return None, f"Server save skipped ({type(e).__name__}: {e}). Download still works."
 
+
+def _offer_export(folder: Path, title: str, body: str, label: str, key: str) -> None:
+    """
+    Build the export only once its Generate button has been pressed, keep the
+    server copy (private mode) and hand the same bytes to the download button.
+    Nothing is held in session state between reruns.
+    """
+    data, fname, mime = _export_bytes(title, body)
+    path, msg = _save_bytes(folder, fname, data)
+    st.download_button(label, data, file_name=fname, mime=mime, key=key)
+    (st.success if path else st.warning)(msg)
+
 # --------------- EVIDENCE EXTRACTION -----------------
 TEXT_EXT = {".txt"}
 DOCX_EXT = {".docx"}
@@ -339,21 +394,170 @@ PPTX_EXT = {".pptx"}
 CSV_EXT = {".csv"}
 PDF_EXT = {".pdf"}  # filename cue only (kept for future)
 
+# Per-file upload cap in MB, matching server.maxUploadSize in .streamlit/config.toml
+MAX_UPLOAD_MB = 50
+
+# Filename cue → artefact weight (contract/JV > SOP/KMP > specs/slides > culture)
+NAME_WEIGHTS: List[Tuple[str, float]] = [
+    ("contract", 1.0),
+    ("msa", 1.0),
+    ("sow", 0.9),
+    ("sla", 0.9),
+    ("agreement", 0.9),
+    ("joint venture", 1.0),
+    ("joint_venture", 1.0),
+    ("jv", 1.0),
+    ("mou", 1.0),
+    ("grant", 0.9),
+    ("licence", 0.9),
+    ("license", 0.9),
+    ("register", 0.9),
+    ("knowledge_management", 0.8),
+    ("kmp", 0.8),
+    ("sop", 0.8),
+    ("process", 0.8),
+    ("safety", 0.8),
+    ("protocol", 0.8),
+    ("spec", 0.6),
+    ("canvas", 0.6),
+    ("bmc", 0.6),
+    ("slides", 0.6),
+    ("deck", 0.6),
+    ("board_pack", 0.8),
+    ("board", 0.8),
+    ("pricing", 0.7),
+    ("tariff", 0.7),
+    ("dataset", 0.7),
+    ("culture", 0.4),
+    ("award", 0.4),
+]
+EXT_DEFAULTS: Dict[str, float] = {
+    ".docx": 0.7,
+    ".pptx": 0.6,
+    ".txt": 0.5,
+    ".csv": 0.6,
+    ".pdf": 0.4,
+}
+
+# One scan per filename: the lookahead reports the longest cue starting at each
+# position; NAME_CUE_WEIGHT folds in any shorter cue that is a prefix of it.
+NAME_WEIGHT_RE = re.compile(
+    "(?=("
+    + "|".join(re.escape(c) for c, _ in sorted(NAME_WEIGHTS, key=lambda cw: -len(cw[0])))
+    + "))"
+)
+NAME_CUE_WEIGHT: Dict[str, float] = {
+    cue: max(w for c, w in NAME_WEIGHTS if cue.startswith(c)) for cue, _ in NAME_WEIGHTS
+}
+NAME_WEIGHT_MAX = max(w for _, w in NAME_WEIGHTS)
+
+
+def _name_weight(lower_name: str, ext: str) -> float:
+    weight = EXT_DEFAULTS.get(ext, 0.4)
+    for m in NAME_WEIGHT_RE.finditer(lower_name):
+        weight = max(weight, NAME_CUE_WEIGHT[m.group(1)])
+        if weight >= NAME_WEIGHT_MAX:
+            break  # top tier reached (e.g. "contract"); later cues cannot raise it
+    return weight
+
+
+# WordprocessingML tags for the zip + XML DOCX reader
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_P, W_TBL, W_TR, W_TC, W_R = W_NS + "p", W_NS + "tbl", W_NS + "tr", W_NS + "tc", W_NS + "r"
+W_T, W_TAB, W_BR, W_CR = W_NS + "t", W_NS + "tab", W_NS + "br", W_NS + "cr"
+W_PTAB, W_NB_HYPHEN, W_HYPERLINK = W_NS + "ptab", W_NS + "noBreakHyphen", W_NS + "hyperlink"
+# Run children python-docx renders as fixed text (w:br only when it is a line break)
+DOCX_RUN_CHARS: Dict[str, str] = {W_TAB: "\t", W_PTAB: "\t", W_CR: "\n", W_NB_HYPHEN: "-"}
+
+
+def _docx_para_text(p: ET.Element) -> str:
+    """
+    A body w:p's text exactly as python-docx's Paragraph.text gives it: only runs
+    that are direct children of the paragraph or of a w:hyperlink in it (runs
+    inside w:ins, w:sdt, w:smartTag, w:fldSimple or text boxes are skipped).
+    """
+    out: List[str] = []
+    for child in p:
+        if child.tag == W_R:
+            runs = (child,)
+        elif child.tag == W_HYPERLINK:
+            runs = child.iterfind(W_R)
+        else:
+            continue
+        for r in runs:
+            for el in r:
+                if el.tag == W_T:
+                    out.append(el.text or "")
+                elif el.tag in DOCX_RUN_CHARS:
+                    out.append(DOCX_RUN_CHARS[el.tag])
+                elif el.tag == W_BR and el.get(W_NS + "type", "textWrapping") == "textWrapping":
+                    out.append("\n")
+    return "".join(out)
+
 
-def _extract_text_docx(data: bytes) -> str:
-    if not HAVE_DOCX:
+def _docx_cell_para_text(p: ET.Element) -> str:
+    """A table-cell w:p's text as the python-docx path reads it: every w:t inside, joined."""
+    return "".join(t.text or "" for t in p.iter(W_T))
+
+
+def _docx_xml_text(stream: BinaryIO) -> str:
+    """
+    Body paragraphs, then table rows, read straight from word/document.xml.
+    iterparse hands over each top-level block at its end tag and the block is
+    cleared once read, so no full object model is built for a text-only pass.
+    """
+    paras: List[str] = []
+    rows: List[str] = []
+    with zipfile.ZipFile(stream) as z, z.open("word/document.xml") as xml:
+        depth = 0
+        for event, el in ET.iterparse(xml, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth != 2:  # only direct children of w:body
+                continue
+            if el.tag == W_P:
+                txt = _docx_para_text(el).strip()
+                if txt:
+                    paras.append(txt)
+            elif el.tag == W_TBL:
+                for tr in el.iterfind(W_TR):
+                    line = " | ".join(
+                        "\n".join(_docx_cell_para_text(p) for p in tc.iterfind(W_P)).strip()
+                        for tc in tr.iterfind(W_TC)
+                    )
+                    if line.strip():
+                        rows.append(line)
+            el.clear()
+    return "\n".join(paras + rows)
+
+
+def _extract_text_docx(stream: BinaryIO) -> str:
+    # Text-only zip + XML read first; python-docx only if the package is unusual
+    try:
+        return _docx_xml_text(stream)
+    except Exception:
+        stream.seek(0)
+    Document, qn = _lazy_docx()
+    if Document is None:
         return ""
     try:
-        bio = io.BytesIO(data)
-        doc = Document(bio)
+        doc = Document(stream)
         parts: List[str] = []
         for p in doc.paragraphs:
             txt = (p.text or "").strip()
             if txt:
                 parts.append(txt)
-        for tbl in getattr(doc, "tables", []):
-            for row in tbl.rows:
-                line = " | ".join((cell.text or "").strip() for cell in row.cells)
+        # Tables straight off the XML: doc.tables/row.cells rebuild proxy objects
+        # (and re-resolve merged cells) on every access, which dominates large contracts
+        w_tbl, w_tr, w_tc, w_p, w_t = qn("w:tbl"), qn("w:tr"), qn("w:tc"), qn("w:p"), qn("w:t")
+        for tbl in doc.element.body.iterchildren(w_tbl):
+            for tr in tbl.iterchildren(w_tr):
+                line = " | ".join(
+                    "\n".join("".join(t.text or "" for t in p.iter(w_t)) for p in tc.iterchildren(w_p)).strip()
+                    for tc in tr.iterchildren(w_tc)
+                )
                 if line.strip():
                     parts.append(line)
         return "\n".join(parts)
@@ -361,140 +565,256 @@ def _extract_text_docx(data: bytes) -> str:
         return ""
 
 
-def _extract_text_pptx(data: bytes) -> str:
-    if not HAVE_PPTX:
-        return ""
-    try:
-        bio = io.BytesIO(data)
-        prs = Presentation(bio)
-        parts: List[str] = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                if hasattr(shape, "text"):
-                    txt = (shape.text or "").strip()
+# PresentationML / DrawingML / OPC names for the zip + XML PPTX reader
+P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+OPC_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+A_P, A_R, A_FLD, A_T, A_BR = A_NS + "p", A_NS + "r", A_NS + "fld", A_NS + "t", A_NS + "br"
+
+
+def _opc_rels(z: zipfile.ZipFile, part: str) -> Dict[str, Tuple[str, str]]:
+    """Relationship id -> (type, target part name) for one package part."""
+    folder, base = posixpath.split(part)
+    rels = ET.fromstring(z.read(f"{folder}/_rels/{base}.rels"))
+    return {
+        rel.get("Id"): (rel.get("Type", ""), posixpath.normpath(posixpath.join(folder, rel.get("Target", ""))))
+        for rel in rels.iter(OPC_REL)
+    }
+
+
+def _pptx_frame_text(tx_body: ET.Element) -> str:
+    """Text of an a:txBody as python-pptx renders it: paragraphs on lines, a:br as a vertical tab."""
+    return "\n".join(
+        "".join(
+            "\v" if el.tag == A_BR else (el.findtext(A_T) or "")
+            for el in p
+            if el.tag in (A_R, A_FLD, A_BR)
+        )
+        for p in tx_body.iterfind(A_P)
+    )
+
+
+def _pptx_xml_text(stream: BinaryIO) -> str:
+    """
+    Slide text straight from the package: for each slide in presentation order,
+    its top-level text shapes, then the notes body placeholder. Only the slide
+    and notes XML parts are parsed; images, layouts and themes are never loaded.
+    """
+    parts: List[str] = []
+    with zipfile.ZipFile(stream) as z:
+        pres_rels = _opc_rels(z, "ppt/presentation.xml")
+        sld_ids = ET.fromstring(z.read("ppt/presentation.xml")).find(P_NS + "sldIdLst")
+        for sld_id in sld_ids if sld_ids is not None else ():
+            slide_part = pres_rels[sld_id.get(R_ID)][1]
+            sp_tree = ET.fromstring(z.read(slide_part)).find(f"{P_NS}cSld/{P_NS}spTree")
+            for sp in sp_tree.iterfind(P_NS + "sp"):
+                tx_body = sp.find(P_NS + "txBody")
+                txt = _pptx_frame_text(tx_body).strip() if tx_body is not None else ""
+                if txt:
+                    parts.append(txt)
+            notes_part = next(
+                (target for kind, target in _opc_rels(z, slide_part).values() if kind.endswith("/notesSlide")),
+                None,
+            )
+            if notes_part is None:
+                continue
+            notes_tree = ET.fromstring(z.read(notes_part)).find(f"{P_NS}cSld/{P_NS}spTree")
+            for sp in notes_tree.iterfind(P_NS + "sp"):
+                ph = sp.find(f"{P_NS}nvSpPr/{P_NS}nvPr/{P_NS}ph")
+                if ph is not None and ph.get("type") == "body":
+                    tx_body = sp.find(P_NS + "txBody")
+                    txt = _pptx_frame_text(tx_body).strip() if tx_body is not None else ""
                     if txt:
                         parts.append(txt)
-            if getattr(slide, "has_notes_slide", False) and slide.notes_slide:
-                nt = (slide.notes_slide.notes_text_frame.text or "").strip()
-                if nt:
-                    parts.append(nt)
+                    break
+    return "\n".join(parts)
+
+
+def _extract_text_pptx(stream: BinaryIO) -> str:
+    # Text-only zip + XML read first; python-pptx only if the package is unusual
+    try:
+        return _pptx_xml_text(stream)
+    except Exception:
+        stream.seek(0)
+    Presentation = _lazy_pptx()
+    if Presentation is None:
+        return ""
+    try:
+        prs = Presentation(stream)
+        # Per slide: text-frame shapes in order, then the speaker notes.
+        # has_text_frame is a plain flag, unlike hasattr(shape, "text") which probes via AttributeError.
+        parts: List[str] = [
+            txt
+            for slide in prs.slides
+            for txt in (
+                *(shape.text_frame.text.strip() for shape in slide.shapes if shape.has_text_frame),
+                slide.notes_slide.notes_text_frame.text.strip() if slide.has_notes_slide else "",
+            )
+            if txt
+        ]
         return "\n".join(parts)
     except Exception:
         return ""
 
 
-def _extract_text_csv(raw: bytes, name: str) -> str:
+def _extract_text_csv(stream: BinaryIO, name: str) -> str:
     """
     CSV semantic extraction: surface headers + a few rows so SME/ESG words
     like 'safety', 'policy', 'contract', 'governance', 'emissions', etc.
     are visible to the heuristics.
     """
+    # Decode lazily off the upload; detach afterwards so the upload stays open
+    wrapper = io.TextIOWrapper(stream, encoding="utf-8", errors="ignore", newline="")
     try:
-        decoded = raw.decode("utf-8", errors="ignore")
-        rows = list(csv.reader(decoded.splitlines()))
-        if not rows:
+        # Lines split as str.splitlines() does, so a quoted cell spanning lines is
+        # joined without its line break, as the whole-text decode().splitlines() did
+        reader = csv.reader(piece for line in wrapper for piece in line.splitlines())
+        first = next(reader, None)
+        if first is None:
             return ""
-        headers = [h.strip() for h in rows[0] if h.strip()]
-        cells: List[str] = []
-        for row in rows[1:11]:
-            cells.extend([c.strip() for c in row if c.strip()])
+        # Each cell is stripped once (walrus) rather than once to test and once to keep
+        headers = [h for cell in first if (h := cell.strip())]
+        # Only the first 10 data rows are surfaced; the rest is never parsed
+        cells: List[str] = [c for row in islice(reader, 10) for cell in row if (c := cell.strip())]
         header_txt = ", ".join(headers)
         cells_txt = "; ".join(cells)
         return f"CSV:{name}\nHeaders: {header_txt}\nRows: {cells_txt}"
     except Exception:
         try:
-            return raw.decode("utf-8", errors="ignore")
+            stream.seek(0)
+            return stream.read().decode("utf-8", errors="ignore")
         except Exception:
             return ""
+    finally:
+        wrapper.detach()
 
 
-def _read_text(files: List[Any]) -> Tuple[str, Dict[str, int], Dict[str, float]]:
+@st.cache_data(max_entries=64, show_spinner=False)
+def _extract_upload_text(digest: str, _f: BinaryIO, ext: str, name: str) -> str:
     """
-    Returns (combined_text, counts_by_ext, weights_used)
+    Text for a single upload, dispatched on extension. Cached on the sha256
+    digest of the upload's bytes (the stream itself is not hashed), so
+    unchanged files are not re-parsed across runs. name is "" for formats in
+    NAME_FREE_EXT, so a renamed re-upload of those hits the same entry.
+    """
+    if ext in TEXT_EXT:
+        return _f.read().decode("utf-8", errors="ignore")
+    if ext in DOCX_EXT:
+        return _extract_text_docx(_f)
+    if ext in PPTX_EXT:
+        return _extract_text_pptx(_f)
+    if ext in CSV_EXT:
+        return _extract_text_csv(_f, name)
+    if ext in PDF_EXT:
+        return f"[[PDF:{name}]]"
+    return f"[[FILE:{name}]]"
+
+
+def _upload_digest(f: Any) -> str:
+    """
+    sha256 of an upload. An UploadedFile is a BytesIO built over the uploaded
+    bytes, and a full read() from offset 0 hands back that same bytes object,
+    so nothing is copied. (getbuffer() would unshare it: a private copy of the
+    whole file that then lives as long as the upload.)
+    """
+    f.seek(0)
+    data = f.read()
+    f.seek(0)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _upload_text(f: Any, ext: str, name: str, digest: str) -> Optional[str]:
+    """One upload's extracted text, or None if it could not be read (safe to run in a worker thread)."""
+    try:
+        # Uploads stay in session and are re-read on every analysis run
+        f.seek(0)
+        return _extract_upload_text(digest, f, ext, name)
+    except Exception:
+        return None
+
+
+def _upload_chunk(name: str, text: Optional[str]) -> str:
+    """One upload's '# name' section of the combined text."""
+    if text is None:
+        return f"\n# {name}\n[[READ-ERROR]]\n"
+    if text.strip():
+        return f"\n# {name}\n{text.strip()}\n"
+    return f"\n# {name}\n[[NO-TEXT-EXTRACTED]]\n"
+
+
+def _collect_texts(results, n_files: int, progress: Optional[Any]) -> List[Optional[str]]:
+    """Gather extracted texts in job order, advancing the progress bar per file."""
+    texts: List[Optional[str]] = []
+    for done, text in enumerate(results, 1):
+        texts.append(text)
+        if progress is not None:
+            progress.progress(done / n_files, text=f"Read {done}/{n_files} file(s)")
+    return texts
+
+
+# Extraction threads: one per upload, capped at 8 and at the cores actually available
+EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+# Formats whose parsing is worth a worker thread (TXT/CSV reads are too short to overlap)
+POOLED_EXT = DOCX_EXT | PPTX_EXT
+# Formats whose extracted text does not mention the file name, so identical content
+# under another name can reuse it (CSV and placeholder text embed the name)
+NAME_FREE_EXT = TEXT_EXT | DOCX_EXT | PPTX_EXT
+
+
+def _read_text(
+    files: List[Any], progress: Optional[Any] = None
+) -> Tuple[Tuple[str, ...], Dict[str, int], Dict[str, float]]:
+    """
+    Returns (chunks, counts_by_ext, weights_used); chunks holds one '# name' section
+    per upload, in upload order, and is never joined into one corpus string.
+    progress: optional st.progress element, advanced (on the script thread) as files finish.
     Weights depend on artefact type (contract/JV > SOP/KMP > specs/slides > culture).
+    Uploads are parsed in place: an UploadedFile is an in-memory BytesIO, so
+    no per-file copy is made on the way to python-docx / python-pptx.
     """
-    chunks: List[str] = []
     counts: Dict[str, int] = {}
     weights_used: Dict[str, float] = {}
 
-    NAME_WEIGHTS: List[Tuple[str, float]] = [
-        ("contract", 1.0),
-        ("msa", 1.0),
-        ("sow", 0.9),
-        ("sla", 0.9),
-        ("agreement", 0.9),
-        ("joint venture", 1.0),
-        ("joint_venture", 1.0),
-        ("jv", 1.0),
-        ("mou", 1.0),
-        ("grant", 0.9),
-        ("licence", 0.9),
-        ("license", 0.9),
-        ("register", 0.9),
-        ("knowledge_management", 0.8),
-        ("kmp", 0.8),
-        ("sop", 0.8),
-        ("process", 0.8),
-        ("safety", 0.8),
-        ("protocol", 0.8),
-        ("spec", 0.6),
-        ("canvas", 0.6),
-        ("bmc", 0.6),
-        ("slides", 0.6),
-        ("deck", 0.6),
-        ("board_pack", 0.8),
-        ("board", 0.8),
-        ("pricing", 0.7),
-        ("tariff", 0.7),
-        ("dataset", 0.7),
-        ("culture", 0.4),
-        ("award", 0.4),
-    ]
-    EXT_DEFAULTS: Dict[str, float] = {
-        ".docx": 0.7,
-        ".pptx": 0.6,
-        ".txt": 0.5,
-        ".csv": 0.6,
-        ".pdf": 0.4,
-    }
-
+    # One extraction job per distinct (content, type): the same artefact uploaded
+    # twice under different names is parsed once and its text reused. Formats whose
+    # text carries the file name also key on the name
+    jobs: List[Tuple[Any, str, str, str]] = []
+    job_by_content: Dict[Tuple[str, str, str], int] = {}
+    sections: List[Tuple[str, int]] = []  # (upload name, index into jobs), in upload order
     for f in files or []:
         name = getattr(f, "name", "file")
         lower_name = str(name).lower()
         ext = Path(lower_name).suffix or "none"
         counts[ext] = counts.get(ext, 0) + 1
 
-        weight = EXT_DEFAULTS.get(ext, 0.4)
-        for cue, w in NAME_WEIGHTS:
-            if cue in lower_name:
-                weight = max(weight, w)
-
-        weights_used[lower_name] = weight
-
-        try:
-            raw = f.read()
-            text = ""
-            if ext in TEXT_EXT:
-                text = raw.decode("utf-8", errors="ignore")
-            elif ext in DOCX_EXT:
-                text = _extract_text_docx(raw)
-            elif ext in PPTX_EXT:
-                text = _extract_text_pptx(raw)
-            elif ext in CSV_EXT:
-                text = _extract_text_csv(raw, name)
-            elif ext in PDF_EXT:
-                text = f"[[PDF:{name}]]"
-            else:
-                text = f"[[FILE:{name}]]"
-
-            if text.strip():
-                chunks.append(f"\n# {name}\n{text.strip()}\n")
-            else:
-                chunks.append(f"\n# {name}\n[[NO-TEXT-EXTRACTED]]\n")
-        except Exception:
-            chunks.append(f"\n# {name}\n[[READ-ERROR]]\n")
+        weights_used[lower_name] = _name_weight(lower_name, ext)
+        digest = _upload_digest(f)
+        # Name-free formats pass "" as the name, so it drops out of the cache key too
+        key_name = "" if ext in NAME_FREE_EXT else name
+        job = job_by_content.setdefault((digest, ext, key_name), len(jobs))
+        if job == len(jobs):
+            jobs.append((f, ext, key_name, digest))
+        sections.append((name, job))
+
+    # Zip inflate in the DOCX/PPTX readers releases the GIL, so several packages overlap.
+    # map() keeps chunks in upload order. With fewer than two such files, or a
+    # single core, the pool only adds thread start-up, so parse inline.
+    n_pooled = sum(ext in POOLED_EXT for _, ext, _, _ in jobs)
+    if n_pooled > 1 and EXTRACT_WORKERS > 1:
+        ctx = get_script_run_ctx() if get_script_run_ctx else None
+        with ThreadPoolExecutor(
+            max_workers=min(EXTRACT_WORKERS, len(jobs)),
+            initializer=add_script_run_ctx if ctx else None,
+            initargs=(None, ctx) if ctx else (),
+        ) as pool:
+            results = pool.map(lambda job: _upload_text(*job), jobs)
+            texts = _collect_texts(results, len(jobs), progress)
+    else:
+        texts = _collect_texts((_upload_text(*job) for job in jobs), len(jobs), progress)
+    chunks = tuple(_upload_chunk(name, texts[job]) for name, job in sections)
 
-    return "\n".join(chunks).strip(), counts, weights_used
+    return chunks, counts, weights_used
 
 # --------------- SME cues / analysis -----------------
 FOUR_LEAF_KEYS: Dict[str, List[str]] = {
@@ -618,6 +938,31 @@ TEN_STEPS = [
     "Report",
 ]
 
+LEAF_LABELS: Tuple[str, ...] = ("Human", "Structural", "Customer", "Strategic Alliance")
+# Positions in the fixed-size score lists used by the analysis engine
+LEAF_IDX: Dict[str, int] = {leaf: i for i, leaf in enumerate(LEAF_LABELS)}
+STEP_IDX: Dict[str, int] = {step: i for i, step in enumerate(TEN_STEPS)}
+LEAF_STRUCTURAL, LEAF_CUSTOMER, LEAF_ALLIANCE = (LEAF_IDX[k] for k in ("Structural", "Customer", "Strategic Alliance"))
+STEP_USE, STEP_VALUE, STEP_REPORT = (STEP_IDX[k] for k in ("Use", "Value", "Report"))
+# Placeholder narratives shown before any analysis has been run
+DEFAULT_TEN_NARRATIVES: Tuple[str, ...] = tuple(f"{s}: tbd" for s in TEN_STEPS)
+# Four-Leaf narrative per (leaf, ticked?)
+LEAF_NARRATIVES: Dict[Tuple[str, bool], str] = {
+    ("Human", True): "Human Capital evidenced (values, awards, training and safety practice), but competency and role-mapping "
+    "should be consolidated into a formal skills register.",
+    ("Human", False): "Human Capital is not yet clearly evidenced; competency mapping, training logs and safety records are needed.",
+    ("Structural", True): "Structural Capital appears IAS 38-ready in places (contracts, SOPs, protocols, registers, CRM and board packs "
+    "are present), supporting audit-ready recognition on the balance sheet.",
+    ("Structural", False): "Structural Capital is under-documented; explicit artefacts (contracts, registers, SOPs, board packs, "
+    "pricing, datasets, CRM) should be consolidated into an auditable IA Register.",
+    ("Customer", True): "Customer Capital is evidenced through relationships, renewal logic and channels, supporting recurring value capture "
+    "and future licensing opportunities.",
+    ("Customer", False): "Customer Capital appears weak in the evidence; relationship histories, renewals, CRM and pipeline data should be structured.",
+    ("Strategic Alliance", True): "Strategic Alliance Capital is evidenced (JVs, MoUs, partners, universities, councils), enabling co-creation "
+    "and ecosystem-based licensing opportunities.",
+    ("Strategic Alliance", False): "Strategic alliances are not clearly evidenced; JV/MoU documentation and partner frameworks are needed.",
+}
+
 SECTOR_CUES = {
     "GreenTech": [
         "recycling",
@@ -744,160 +1089,245 @@ SEVEN_STAKEHOLDER_CUES: List[str] = [
     "biodiversity",
 ]
 
+# Filename cue groups → (Four-Leaf, Ten-Steps) bumps per unit of file weight
+FILE_CUE_RULES: Tuple[Tuple[Tuple[str, ...], Tuple[Tuple[str, float], ...], Tuple[Tuple[str, float], ...]], ...] = (
+    # Contracts / grants / agreements → Structural dominates, Customer/SA secondary
+    (
+        ("contract", "msa", "sow", "sla", "po", "agreement"),
+        (("Structural", 2.5), ("Customer", 1.0)),
+        (("Control", 2.0), ("Use", 2.5)),
+    ),
+    (
+        ("joint_venture", "joint venture", "jv", "mou", "grant"),
+        (("Structural", 2.5), ("Strategic Alliance", 1.5)),
+        (("Control", 2.0), ("Use", 2.0)),
+    ),
+    # Knowledge / SOP / KMP / safety / ISO → Structural + Human
+    (
+        ("knowledge", "kmp", "sop", "process", "safety", "protocol", "risk", "qms", "iso"),
+        (("Structural", 1.8), ("Human", 0.8)),
+        (("Identify", 1.8), ("Separate", 1.4), ("Manage", 1.6), ("Safeguard", 1.0)),
+    ),
+    # Specs/slides/canvas → Structural + Use
+    (
+        ("spec", "canvas", "deck", "slides", "pptx"),
+        (("Structural", 0.8),),
+        (("Identify", 0.8), ("Use", 0.6)),
+    ),
+    # Pricing/licensing hints → Use/Value (multi value streams)
+    (
+        ("price", "pricing", "royalty", "subscription", "oem", "white label"),
+        (),
+        (("Use", 1.2), ("Value", 1.6)),
+    ),
+    # Governance/reporting → Monitor/Report
+    (
+        ("board", "report", "dashboard", "audit"),
+        (),
+        (("Report", 1.4), ("Monitor", 1.2)),
+    ),
+)
+# One alternation per rule, so each filename test is a single regex search,
+# and the rule's bumps keyed by LEAF_IDX / STEP_IDX position
+FILE_CUE_RULE_RES: Tuple["re.Pattern[str]", ...] = tuple(
+    re.compile("|".join(map(re.escape, name_cues))) for name_cues, _, _ in FILE_CUE_RULES
+)
+FILE_CUE_BUMPS: Tuple[Tuple[Tuple[Tuple[int, float], ...], Tuple[Tuple[int, float], ...]], ...] = tuple(
+    (
+        tuple((LEAF_IDX[leaf], mult) for leaf, mult in leaf_bumps),
+        tuple((STEP_IDX[step], mult) for step, mult in step_bumps),
+    )
+    for _, leaf_bumps, step_bumps in FILE_CUE_RULES
+)
+
+# --------------- CUE SCANNER -------------------------
+# Four-Leaf cues flattened into parallel (cue, leaf index) columns
+def _cue_leaf_index(pairs) -> Dict[str, Tuple[int, ...]]:
+    """cue -> leaf indices it bumps (repeated when a cue is listed more than once)."""
+    index: Dict[str, List[int]] = {}
+    for cue, leaf in pairs:
+        index.setdefault(cue, []).append(leaf)
+    return {cue: tuple(leaves) for cue, leaves in index.items()}
+
+
+CUE_LEAVES: Dict[str, Tuple[int, ...]] = _cue_leaf_index(
+    (c, LEAF_IDX[leaf]) for leaf, cues in FOUR_LEAF_KEYS.items() for c in cues
+)
+
+# Leaves reinforced by sector cues once the sector itself is evidenced
+SECTOR_REINFORCED_LEAVES: Tuple[str, ...] = ("Structural", "Customer", "Strategic Alliance")
+SECTOR_CUE_LEAVES: Dict[str, Dict[str, Tuple[int, ...]]] = {
+    sector: _cue_leaf_index((c, LEAF_IDX[leaf]) for leaf in SECTOR_REINFORCED_LEAVES for c in cues)
+    for sector, cues in SECTOR_CUES.items()
+}
+
+# Every cue the engine tests for, de-duplicated so each is looked up once per analysis
+ALL_CUES: Tuple[str, ...] = tuple(sorted(
+    {c for cues in FOUR_LEAF_KEYS.values() for c in cues}
+    | {c for cues in SECTOR_CUES.values() for c in cues}
+    | set(EXPLICIT_STRUCTURAL_CUES)
+    | set(ESG_CUES)
+    | set(SEVEN_STAKEHOLDER_CUES)
+))
+# Fallback scanner split: cues without whitespace, and phrases with their whitespace-free pieces
+SOLID_CUES: Tuple[str, ...] = tuple(c for c in ALL_CUES if c.split() == [c])
+PHRASE_CUES: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+    (c, tuple(c.split())) for c in ALL_CUES if c not in SOLID_CUES
+)
+
+# Cue groups as sets: "any cue of the group was hit" is one isdisjoint() on the hit set
+ESG_CUE_SET: FrozenSet[str] = frozenset(ESG_CUES)
+STAKEHOLDER_CUE_SET: FrozenSet[str] = frozenset(SEVEN_STAKEHOLDER_CUES)
+SECTOR_CUE_SETS: Dict[str, FrozenSet[str]] = {sector: frozenset(cues) for sector, cues in SECTOR_CUES.items()}
+
+
+@st.cache_resource(show_spinner=False)
+def _build_cue_automaton(cues: Tuple[str, ...]) -> Optional[Any]:
+    """
+    Aho-Corasick automaton over the cue list. Streamlit re-executes this module on
+    every rerun, so the automaton is held as a process-wide resource keyed on the
+    cues and built once per server process rather than once per rerun.
+    """
+    if not HAVE_AHOCORASICK:
+        return None
+    automaton = ahocorasick.Automaton()
+    for cue in cues:
+        automaton.add_word(cue, cue)
+    automaton.make_automaton()
+    return automaton
+
+
+CUE_AUTOMATON = _build_cue_automaton(ALL_CUES)
+
+
+def _cue_hits(t_all: str) -> FrozenSet[str]:
+    """
+    Cues from ALL_CUES that occur as substrings of the (lowercased) text.
+    One Aho-Corasick pass when pyahocorasick is installed, otherwise substring
+    searches over the distinct whitespace-delimited tokens: an occurrence of a
+    cue without whitespace always lies inside one token, and a phrase can only
+    occur if each of its pieces does, so only those phrases are searched in the
+    full text. Matching stays on str: ASCII evidence is already stored one byte
+    per character, so a bytes copy buys nothing.
+    """
+    if CUE_AUTOMATON is None:
+        vocab = " ".join(set(t_all.split()))
+        found = [c for c in SOLID_CUES if c in vocab]
+        found.extend(c for c, pieces in PHRASE_CUES if all(p in vocab for p in pieces) and c in t_all)
+        return frozenset(found)
+    found = set()
+    for _, cue in CUE_AUTOMATON.iter(t_all):
+        found.add(cue)
+        if len(found) == len(ALL_CUES):
+            break
+    return frozenset(found)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _part_cue_hits(part_key: str, _part: str) -> FrozenSet[str]:
+    """
+    _cue_hits for one scanned part, cached on its digest (part_key). Parts are the
+    per-upload sections plus the [CTX] stub, so adding a file or editing the company
+    context scans only what changed.
+    """
+    # str.lower() is a single C pass (~2 ms on 2.5 MB against ~400 ms for the
+    # cue scan); an encode + bytes.translate fold measured slower, so keep it
+    return _cue_hits((_part or "").lower())
+
 # --------------- ANALYSIS ENGINE ---------------------
+@st.cache_data(max_entries=16, show_spinner=False)
 def _analyse_weighted(
-    text: str,
+    part_keys: Tuple[str, ...],
+    _text_parts: Tuple[str, ...],
     weights_by_file: Dict[str, float],
+    sector: str,
 ) -> Tuple[Dict[str, Any], Dict[str, float], Dict[str, Any], int]:
     """
-    Weighted Four-Leaf & Ten-Steps.
+    Weighted Four-Leaf & Ten-Steps (cached per part digests / file weights / sector).
+    part_keys holds one digest per entry of _text_parts; the leading underscore keeps
+    st.cache_data from re-hashing the multi-MB evidence text on every call.
+    Each part (one per upload section, then the context stub) is lowercased and
+    scanned on its own; cues contain no line breaks, so none can straddle a part
+    boundary and the union of part hits equals a scan of the joined text.
     Returns:
       ic_map (with tick/narrative/score),
       leaf_scores (raw weighted scores for 4-leaf),
       ten (scores+narratives),
       quality% (heuristic)
     """
-    sector = st.session_state.get("sector", "Other")
-    t_all = (text or "").lower()
-
-    leaf_scores: Dict[str, float] = {
-        "Human": 0.0,
-        "Structural": 0.0,
-        "Customer": 0.0,
-        "Strategic Alliance": 0.0,
-    }
-    step_scores: Dict[str, float] = {s: 0.0 for s in TEN_STEPS}
+    hits = frozenset().union(*(_part_cue_hits(k, part) for k, part in zip(part_keys, _text_parts)))
+
+    # Fixed-size score lists indexed by LEAF_IDX / STEP_IDX; leaf_scores is
+    # returned as a dict keyed by leaf name
+    leaf_scores: List[float] = [0.0] * len(LEAF_LABELS)
+    step_scores: List[float] = [0.0] * len(TEN_STEPS)
 
-    sector_present = False
-    if sector in SECTOR_CUES:
-        if any(c in t_all for c in SECTOR_CUES[sector]):
-            sector_present = True
+    sector_present = not hits.isdisjoint(SECTOR_CUE_SETS.get(sector, frozenset()))
 
     # ----- Structural vs Tacit weighting -----
-    max_weight = max(weights_by_file.values() or [0.4])
+    # File-weight aggregates, computed once (also feed evidence quality below)
+    n_files = len(weights_by_file)
+    w_sum = sum(weights_by_file.values())
+    max_weight = max(weights_by_file.values(), default=0.4)
 
     # Base structural emphasis from explicit cues anywhere in the text (IAS 38 explicit assets)
     for cue in EXPLICIT_STRUCTURAL_CUES:
-        if cue in t_all:
-            leaf_scores["Structural"] += max_weight * 1.5  # audit-ready bump
-
-    # Four-Leaf cues (with sector reinforcement)
-    for leaf, cues in FOUR_LEAF_KEYS.items():
-        eff = list(cues)
-        if sector_present and leaf in ("Structural", "Customer", "Strategic Alliance"):
-            eff += SECTOR_CUES[sector]
-        base = 0.0
-        for cue in eff:
-            if cue in t_all:
-                base += max_weight
-        leaf_scores[leaf] += base
+        if cue in hits:
+            leaf_scores[LEAF_STRUCTURAL] += max_weight * 1.5  # audit-ready bump
 
-    # Ten-Steps scoring (file-name based + ESG / FRAND cues)
-    def bump(step: str, amt: float) -> None:
-        step_scores[step] = step_scores.get(step, 0.0) + amt
+    # Four-Leaf cues (with sector reinforcement): each cue hit adds max_weight to its leaf.
+    # Walk the hit cues (not every cue) and map each to its leaf indices.
+    leaf_hits = Counter(leaf for cue in hits for leaf in CUE_LEAVES.get(cue, ()))
+    if sector_present:
+        sector_leaves = SECTOR_CUE_LEAVES[sector]
+        leaf_hits.update(leaf for cue in hits for leaf in sector_leaves.get(cue, ()))
+    for leaf, n_hits in leaf_hits.items():
+        leaf_scores[leaf] += n_hits * max_weight
 
+    # Ten-Steps scoring (file-name based + ESG / FRAND cues)
+    # weights_by_file keys are already lowercased by _read_text
     for fname, w in (weights_by_file or {}).items():
-        n = fname.lower()
-
-        # Contracts / grants / agreements → Structural dominates, Customer/SA secondary
-        if any(k in n for k in ["contract", "msa", "sow", "sla", "po", "agreement"]):
-            leaf_scores["Structural"] += 2.5 * w
-            leaf_scores["Customer"] += 1.0 * w
-            bump("Control", 2.0 * w)
-            bump("Use", 2.5 * w)
-
-        if any(k in n for k in ["joint_venture", "joint venture", "jv", "mou", "grant"]):
-            leaf_scores["Structural"] += 2.5 * w
-            leaf_scores["Strategic Alliance"] += 1.5 * w
-            bump("Control", 2.0 * w)
-            bump("Use", 2.0 * w)
-
-        # Knowledge / SOP / KMP / safety / ISO → Structural + Human
-        if any(k in n for k in ["knowledge", "kmp", "sop", "process", "safety", "protocol", "risk", "qms", "iso"]):
-            leaf_scores["Structural"] += 1.8 * w
-            leaf_scores["Human"] += 0.8 * w
-            bump("Identify", 1.8 * w)
-            bump("Separate", 1.4 * w)
-            bump("Manage", 1.6 * w)
-            bump("Safeguard", 1.0 * w)
-
-        # Specs/slides/canvas → Structural + Use
-        if any(k in n for k in ["spec", "canvas", "deck", "slides", "pptx"]):
-            leaf_scores["Structural"] += 0.8 * w
-            bump("Identify", 0.8 * w)
-            bump("Use", 0.6 * w)
-
-        # Pricing/licensing hints → Use/Value (multi value streams)
-        if any(k in n for k in ["price", "pricing", "royalty", "subscription", "oem", "white label"]):
-            bump("Use", 1.2 * w)
-            bump("Value", 1.6 * w)
-
-        # Governance/reporting → Monitor/Report
-        if any(k in n for k in ["board", "report", "dashboard", "audit"]):
-            bump("Report", 1.4 * w)
-            bump("Monitor", 1.2 * w)
+        for rule_re, (leaf_bumps, step_bumps) in zip(FILE_CUE_RULE_RES, FILE_CUE_BUMPS):
+            if rule_re.search(fname):
+                for li, mult in leaf_bumps:
+                    leaf_scores[li] += mult * w
+                for si, mult in step_bumps:
+                    step_scores[si] += mult * w
 
     # ESG & Seven Stakeholder presence → boost Report/Value (double materiality)
-    esg_hits = any(c in t_all for c in ESG_CUES)
-    stakeholder_hits = any(c in t_all for c in SEVEN_STAKEHOLDER_CUES)
+    esg_hits = not hits.isdisjoint(ESG_CUE_SET)
+    stakeholder_hits = not hits.isdisjoint(STAKEHOLDER_CUE_SET)
     if esg_hits or stakeholder_hits:
-        bump("Report", 1.2)
-        bump("Value", 1.0)
+        step_scores[STEP_REPORT] += 1.2
+        step_scores[STEP_VALUE] += 1.0
 
     if sector_present:
-        bump("Use", 0.8)
-        bump("Report", 0.5)
+        step_scores[STEP_USE] += 0.8
+        step_scores[STEP_REPORT] += 0.5
 
     # Make sure Structural "wins" when explicit + tacit both present:
     # if Structural>0 and (Customer or SA also high), add a small dominance bump.
-    if leaf_scores["Structural"] > 0 and (leaf_scores["Customer"] > 0 or leaf_scores["Strategic Alliance"] > 0):
-        leaf_scores["Structural"] *= 1.15  # dominance tweak
+    if leaf_scores[LEAF_STRUCTURAL] > 0 and (leaf_scores[LEAF_CUSTOMER] > 0 or leaf_scores[LEAF_ALLIANCE] > 0):
+        leaf_scores[LEAF_STRUCTURAL] *= 1.15  # dominance tweak
 
-    # Convert leaf_scores -> ticks & narratives
+    # Convert leaf_scores -> ticks & narratives (LEAF_NARRATIVES)
     ic_map: Dict[str, Any] = {}
-    avg_leaf = (sum(leaf_scores.values()) / max(1, len(leaf_scores)))
+    avg_leaf = sum(leaf_scores) / len(leaf_scores)
     threshold = max(1.0, avg_leaf * 0.6)
+    n_ticked = 0
 
-    for leaf, score in leaf_scores.items():
+    for leaf, score in zip(LEAF_LABELS, leaf_scores):
         tick = score >= threshold
-        if leaf == "Human":
-            nar = (
-                "Human Capital evidenced (values, awards, training and safety practice), but competency and role-mapping "
-                "should be consolidated into a formal skills register."
-                if tick
-                else "Human Capital is not yet clearly evidenced; competency mapping, training logs and safety records are needed."
-            )
-        elif leaf == "Structural":
-            nar = (
-                "Structural Capital appears IAS 38-ready in places (contracts, SOPs, protocols, registers, CRM and board packs "
-                "are present), supporting audit-ready recognition on the balance sheet."
-                if tick
-                else "Structural Capital is under-documented; explicit artefacts (contracts, registers, SOPs, board packs, "
-                "pricing, datasets, CRM) should be consolidated into an auditable IA Register."
-            )
-        elif leaf == "Customer":
-            nar = (
-                "Customer Capital is evidenced through relationships, renewal logic and channels, supporting recurring value capture "
-                "and future licensing opportunities."
-                if tick
-                else "Customer Capital appears weak in the evidence; relationship histories, renewals, CRM and pipeline data should be structured."
-            )
-        else:
-            nar = (
-                "Strategic Alliance Capital is evidenced (JVs, MoUs, partners, universities, councils), enabling co-creation "
-                "and ecosystem-based licensing opportunities."
-                if tick
-                else "Strategic alliances are not clearly evidenced; JV/MoU documentation and partner frameworks are needed."
-            )
-        ic_map[leaf] = {"tick": tick, "narrative": nar, "score": round(score, 2)}
+        n_ticked += tick
+        ic_map[leaf] = {"tick": tick, "narrative": LEAF_NARRATIVES[leaf, tick], "score": round(score, 2)}
 
     # Ten-Steps scores
     base = 3.0
     ten_scores: List[int] = []
     ten_narrs: List[str] = []
 
-    for step in TEN_STEPS:
-        s_float = base + step_scores.get(step, 0.0)
+    for step, step_score in zip(TEN_STEPS, step_scores):
+        s_float = base + step_score
         s = int(max(1, min(10, round(s_float))))
         ten_scores.append(s)
         ten_narrs.append(f"{step}: readiness ≈ {s}/10.")
@@ -905,24 +1335,29 @@ def _analyse_weighted(
     ten = {"scores": ten_scores, "narratives": ten_narrs}
 
     # Evidence quality metric
-    files_factor = min(1.0, len(weights_by_file) / 6.0)
-    leaf_div = sum(1 for v in ic_map.values() if v["tick"]) / 4.0
-    weight_mean = (sum(weights_by_file.values()) / max(1, len(weights_by_file))) if weights_by_file else 0.4
+    files_factor = min(1.0, n_files / 6.0)
+    leaf_div = n_ticked / 4.0
+    weight_mean = (w_sum / n_files) if n_files else 0.4
     quality = int(round(100 * (0.45 * files_factor + 0.35 * leaf_div + 0.20 * min(1.0, weight_mean))))
 
-    return ic_map, leaf_scores, ten, quality
+    return ic_map, dict(zip(LEAF_LABELS, leaf_scores)), ten, quality
 
 # --------------- INTERPRETIVE NARRATIVE --------------
+@st.cache_data(max_entries=64, show_spinner=False)
 def _build_interpreted_summary(
     case: str,
+    sector: str,
+    size: str,
     leaf_scores: Dict[str, float],
     ic_map: Dict[str, Any],
     ten: Dict[str, Any],
     evidence_quality: int,
-    context: Dict[str, str],
+    context: AnalysisContext,
 ) -> str:
-    sector = st.session_state.get("sector", "Other")
-    size = st.session_state.get("company_size", "Micro (1–10)")
+    """
+    Interpreted IC narrative. Pure in its arguments (sector and size are passed in rather
+    than read from session state), so repeat runs on the same results reuse the text.
+    """
 
     strengths = [k for k, v in ic_map.items() if v.get("tick")]
     gaps = [k for k, v in ic_map.items() if not v.get("tick")]
@@ -932,9 +1367,10 @@ def _build_interpreted_summary(
     weak_steps = [s for s, sc in zip(TEN_STEPS, ts) if sc <= 5]
 
     # Detect whether ESG & Seven Stakeholder cues are present
-    narrative_text = context.get("why", "") + " " + context.get("markets", "")
-    seven_hit = any(c in narrative_text.lower() for c in SEVEN_STAKEHOLDER_CUES)
-    esg_hit = any(c in narrative_text.lower() for c in ESG_CUES)
+    # (one lowercase copy and one cue scan, instead of a .lower() per cue tested)
+    narrative_hits = _cue_hits((context.why + " " + context.markets).lower())
+    seven_hit = not narrative_hits.isdisjoint(STAKEHOLDER_CUE_SET)
+    esg_hit = not narrative_hits.isdisjoint(ESG_CUE_SET)
 
     # 1) Context & positioning
     p1 = (
@@ -1012,12 +1448,73 @@ def _build_interpreted_summary(
 
     return "\n\n".join([p1, p2, p3, p4, p5])
 
+@st.cache_data(show_spinner=False)
+def _format_ten_steps_md(steps: Tuple[str, ...], narratives: Tuple[str, ...]) -> str:
+    """Markdown for the 'Narrative per step' expander (one block, cached per narrative set)."""
+    return "\n\n".join(f"**{s}** — {n}" for s, n in zip(steps, narratives))
+
+@st.cache_data(show_spinner=False)
+def _format_file_counts_md(counts: Tuple[Tuple[str, int], ...]) -> str:
+    """'Files by type' panel on the Analyse page as one markdown block."""
+    lines = "\n".join(f"- `{ext}` → {n} file(s)" for ext, n in counts)
+    return f"**Files by type (session):**\n{lines}"
+
+@dataclass(frozen=True, slots=True)
+class AnalysisContext:
+    """Company-context answers used by the interpreted summary and the [CTX] stub."""
+    why: str
+    stage: str
+    plan_s: str
+    plan_m: str
+    plan_l: str
+    markets: str
+    sale: str
+
+
+# Company-context fields as (AnalysisContext field, session key); stub slice lengths below
+CONTEXT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("why", "why_service"),
+    ("stage", "stage"),
+    ("plan_s", "plan_s"),
+    ("plan_m", "plan_m"),
+    ("plan_l", "plan_l"),
+    ("markets", "markets_why"),
+    ("sale", "sale_price_why"),
+)
+CTX_STUB_LONG = 140
+CTX_STUB_SHORT = 60
+
+
+def _analysis_context() -> Tuple[AnalysisContext, str]:
+    """
+    Company context for the interpreted summary, plus the [CTX] stub appended to the
+    evidence text for cue detection. Rebuilt only when a context field has changed.
+    """
+    state = st.session_state
+    key = tuple(state.get(sk, "") for _, sk in CONTEXT_FIELDS)
+    if state.get("_ctx_fields") != key:
+        context = AnalysisContext(**{ck: v for (ck, _), v in zip(CONTEXT_FIELDS, key)})
+        state["_ctx_stub"] = (
+            f"[CTX] why={context.why[:CTX_STUB_LONG]} | stage={context.stage[:CTX_STUB_LONG]} | "
+            f"plans=({context.plan_s[:CTX_STUB_SHORT]}/{context.plan_m[:CTX_STUB_SHORT]}/{context.plan_l[:CTX_STUB_SHORT]}) | "
+            f"markets={context.markets[:CTX_STUB_LONG]} | sale={context.sale[:CTX_STUB_SHORT]}"
+        )
+        state["_ctx"] = context
+        state["_ctx_fields"] = key
+    return state["_ctx"], state["_ctx_stub"]
+
 # --------- COMPANY CONTEXT AUTO-SPLIT HELPER ----------
+# Blank-line paragraph break (LF or CRLF), then sentence boundary as the fallback
+PARAGRAPH_SPLIT_RE = re.compile(r"\r?\n\r?\n")
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
 def _auto_split_expert_block(text: str) -> Dict[str, str]:
     """
     Take a single pasted block and try to split it across:
     why_service, stage, plan_s, plan_m, plan_l, markets_why, sale_price_why
-    using blank lines or sentence boundaries.
+    using blank lines or sentence boundaries (cached per pasted block).
     """
     t = (text or "").strip()
     keys = [
@@ -1032,10 +1529,11 @@ def _auto_split_expert_block(text: str) -> Dict[str, str]:
     if not t:
         return {k: "" for k in keys}
 
-    blocks = [b.strip() for b in t.replace("\r\n", "\n").split("\n\n") if b.strip()]
+    blocks = [b.strip() for b in PARAGRAPH_SPLIT_RE.split(t) if b.strip()]
 
     if len(blocks) < 5:
-        blocks = [s.strip() for s in re.split(r"(?<=[.!?])\s+", t) if s.strip()]
+        # Only the first len(keys) sentences are used, so stop splitting after those
+        blocks = [s.strip() for s in SENTENCE_SPLIT_RE.split(t, maxsplit=len(keys)) if s.strip()]
 
     out: Dict[str, str] = {k: "" for k in keys}
     for k, chunk in zip(keys, blocks):
@@ -1050,8 +1548,14 @@ ss.setdefault("company_type", "Registered company / SME")
 ss.setdefault("sector", "Other")
 ss.setdefault("uploads", [])
 ss.setdefault("combined_text", "")
+ss.setdefault("combined_preview_text", "")
 ss.setdefault("ic_map", {})
-ss.setdefault("ten_steps", {})
+# Ten-Steps placeholder is built once per session; pages read ss["ten_steps"] directly
+if not ss.get("ten_steps"):
+    ss["ten_steps"] = {
+        "scores": [5] * len(TEN_STEPS),
+        "narratives": list(DEFAULT_TEN_NARRATIVES),
+    }
 ss.setdefault("narrative", "")
 ss.setdefault("leaf_scores", {})
 ss.setdefault("evidence_quality", 0)
@@ -1097,6 +1601,8 @@ SECTORS = [
     "Energy",
     "Other",
 ]
+# Selectbox position per sector; unknown sectors fall back to "Other"
+SECTOR_IDX: Dict[str, int] = {s: i for i, s in enumerate(SECTORS)}
 
 # New: organisation / project type (covers pre-company & spin-outs)
 COMPANY_TYPES = [
@@ -1162,364 +1668,377 @@ with st.sidebar:
 if page == "Company":
     st.header("Company / project details")
 
-    with st.form("company_form"):
-        c1, c2, c3 = st.columns([1.1, 1, 1])
-        with c1:
-            case_name = st.text_input(
-                "Company or project name *",
-                ss.get("case_name", ""),
-                help="If you don’t have a registered company yet, use your project or working title."
-            )
-        with c2:
-            size = st.selectbox(
-                "Size (now or planned)",
-                SIZES,
-                index=SIZES.index(ss.get("company_size", SIZES[0])),
+    @st.fragment
+    def _company_form() -> None:
+        """
+        Company form + upload summary. Runs as a fragment so "Save details"
+        only re-executes this form, not the whole page script.
+        """
+        with st.form("company_form", clear_on_submit=False):
+            c1, c2, c3 = st.columns([1.1, 1, 1])
+            with c1:
+                case_name = st.text_input(
+                    "Company or project name *",
+                    ss.get("case_name", ""),
+                    help="If you don’t have a registered company yet, use your project or working title."
+                )
+            with c2:
+                size = st.selectbox(
+                    "Size (now or planned)",
+                    SIZES,
+                    index=SIZES.index(ss.get("company_size", SIZES[0])),
+                )
+            with c3:
+                current_sector = ss.get("sector", "Other")
+                sector_index = SECTOR_IDX.get(current_sector, SECTOR_IDX["Other"])
+                sector = st.selectbox(
+                    "Sector / Industry",
+                    SECTORS,
+                    index=sector_index,
+                )
+
+            # NEW: organisation / project type (covers pre-company & spin-outs)
+            stored_type = ss.get("company_type", "Registered company / SME")
+            if stored_type in COMPANY_TYPES:
+                company_type_index = COMPANY_TYPES.index(stored_type)
+            else:
+                company_type_index = 0
+
+            company_type = st.selectbox(
+                "What best describes this organisation or project?",
+                COMPANY_TYPES,
+                index=company_type_index,
+                help="Covers registered companies, pre-startups, spin-outs, innovation hubs, university-based projects and large corporates.",
+               )
+
+            st.markdown("#### Simple questions to set the scene (for licensing)")
+
+            st.markdown("#### Valuation & Exit Timing (for planning)")
+
+            colv1, colv2 = st.columns(2)
+
+            with colv1:
+                last_valuation_date = st.date_input(
+                    "Date of last valuation (if any)",
+                    value=datetime.date(2025, 12, 31),
+                    key="last_valuation_date",
+                    help="If a valuation has already been carried out, enter the date."
+                )
+
+            with colv2:
+                exit_date = st.date_input(
+                    "Suggested or expected exit date",
+                    value=datetime.date(2027, 1, 1),
+                    key="exit_date",
+                    help="When do you expect a sale, investment, or restructuring event to take place?"
+                )
+            # --- Q1: What are you working on? ---
+            q1_type_options = [
+                "New product",
+                "New service",
+                "Software / app",
+                "Online platform or portal",
+                "Training or learning content",
+                "Data or analytics",
+                "Method / process or toolkit",
+                "Brand / marketing concept",
+                "Other idea",
+            ]
+            q1_type = st.multiselect(
+                "1) What are you working on? *",
+                q1_type_options,
+                help="Tick all that apply. This can be a company, project, spin-out, or early idea.",
             )
-        with c3:
-            current_sector = ss.get("sector", "Other")
-            sector_index = SECTORS.index(current_sector) if current_sector in SECTORS else SECTORS.index("Other")
-            sector = st.selectbox(
-                "Sector / Industry",
-                SECTORS,
-                index=sector_index,
+            q1_desc = st.text_area(
+                "Short description (one or two sentences)",
+                ss.get("why_service", ""),
+                height=70,
             )
 
-        # NEW: organisation / project type (covers pre-company & spin-outs)
-        stored_type = ss.get("company_type", "Registered company / SME")
-        if stored_type in COMPANY_TYPES:
-            company_type_index = COMPANY_TYPES.index(stored_type)
-        else:
-            company_type_index = 0
+            # --- Q2: Where are you on the journey? ---
+            q2_stage_options = [
+                "Idea only / early concept",
+                "Prototype or proof-of-concept",
+                "Pilot with first users",
+                "First paying customers",
+                "Growing / scaling",
+                "Established product or service",
+            ]
+            q2_stage_choice = st.selectbox(
+                "2) Where are you on the journey right now? *",
+                q2_stage_options,
+                index=0,
+                help="Roughly where you are today — this doesn’t need to be perfect.",
+            )
+            q2_notes = st.text_area(
+                "Anything important about your current stage (optional)",
+                ss.get("stage", ""),
+                height=60,
+            )
 
-        company_type = st.selectbox(
-            "What best describes this organisation or project?",
-            COMPANY_TYPES,
-            index=company_type_index,
-            help="Covers registered companies, pre-startups, spin-outs, innovation hubs, university-based projects and large corporates.",
-           )
+            # --- Q3: Who should use this, and where? ---
+            q3_user_options = [
+                "Households / general public",
+                "Small businesses / SMEs",
+                "Large companies",
+                "Government / public bodies",
+                "Hospitals / clinics",
+                "Schools / universities",
+                "Farmers or producers",
+                "NGOs / community groups",
+                "Other (not listed)",
+            ]
+            q3_region_options = [
+                "Local only",
+                "National",
+                "Regional (e.g. EU, East Africa)",
+                "Across Africa",
+                "Across Europe",
+                "Global",
+            ]
+            q3_users = st.multiselect(
+                "3) Who do you want to use this? *",
+                q3_user_options,
+                help="Tick all that apply.",
+            )
+            q3_regions = st.multiselect(
+                "Where do you mainly want to use or sell it? *",
+                q3_region_options,
+            )
+            q3_notes = st.text_area(
+                "Key countries or regions (optional)",
+                ss.get("plan_s", ""),
+                height=60,
+            )
 
-        st.markdown("#### Simple questions to set the scene (for licensing)")
+            # --- Q4: What do you already have written down or built? ---
+            q4_asset_options = [
+                "Nothing written down yet",
+                "Notes or concept document",
+                "Slides / pitch deck",
+                "Business plan or canvas",
+                "Prototype / demo",
+                "Working software / app",
+                "Datasets or analytics",
+                "Training or learning materials",
+                "Brand assets (name, logo, style)",
+                "Website or landing page",
+                "Policies, SOPs or manuals",
+                "Contracts or agreements",
+            ]
+            q4_assets = st.multiselect(
+                "4) What do you already have written down or built? *",
+                q4_asset_options,
+                help="Tick everything you already have. The documents themselves can be uploaded below.",
+            )
+            q4_notes = st.text_area(
+                "Anything else you have already created (optional)",
+                ss.get("plan_m", ""),
+                height=60,
+            )
 
-        st.markdown("#### Valuation & Exit Timing (for planning)")
+            # --- Q5: Who else is involved, and what’s agreed? ---
+            q5_who_options = [
+                "Just me / us (founder team)",
+                "Co-founders",
+                "University or research institute",
+                "Current employer",
+                "Investor or funder",
+                "Customer / client",
+                "Supplier or tech partner",
+                "Government or public body",
+                "NGO / community group",
+                "Other partner",
+            ]
+            q5_agree_options = [
+                "Nothing formal yet",
+                "Informal discussions only",
+                "Emails that talk about roles or rights",
+                "NDA / confidentiality agreement",
+                "Grant agreement",
+                "Commercial contract",
+                "IP or licence agreement",
+                "Don’t know / need to check",
+            ]
+            q5_who = st.multiselect(
+                "5) Who else is involved? *",
+                q5_who_options,
+            )
+            q5_agreed = st.multiselect(
+                "What (if anything) has already been agreed in writing? *",
+                q5_agree_options,
+            )
+            q5_notes = st.text_area(
+                "Anything sensitive or important about these relationships (optional)",
+                ss.get("plan_l", ""),
+                height=60,
+            )
 
-        colv1, colv2 = st.columns(2)
+            # --- Q6: How do you hope to earn from this, and what are you happy to share? ---
+            q6_earn_options = [
+                "One-off sales",
+                "Subscription (monthly or yearly)",
+                "Pay-per-use",
+                "Revenue share",
+                "Licence fees / royalties",
+                "Consulting or services",
+                "Advertising / sponsorship",
+                "Not sure yet",
+            ]
+            q6_share_options = [
+                "Keep fully private / closed",
+                "Only for paying customers",
+                "Lower-cost access for SMEs / start-ups",
+                "Free or low-cost for community / public sector",
+                "Open for non-commercial use",
+                "Open source (code or content)",
+                "Not sure yet",
+            ]
+            q6_earn_sel = st.multiselect(
+                "6) How do you hope to earn from this? *",
+                q6_earn_options,
+            )
+            q6_share_sel = st.multiselect(
+                "What are you happy to share or make easier to access? *",
+                q6_share_options,
+            )
+            q6_notes = st.text_area(
+                "Anything else about pricing, access or fairness (optional)",
+                ss.get("markets_why", ""),
+                height=60,
+            )
 
-        with colv1:
-            last_valuation_date = st.date_input(
-                "Date of last valuation (if any)",
-                value=datetime.date(2025, 12, 31),
-                key="last_valuation_date",
-                help="If a valuation has already been carried out, enter the date."
+            st.caption("Uploads are held in session until analysis. Nothing is written to server until export.")
+            st.markdown("#### Suggested Evidence (for stronger results)")
+
+            st.info(
+                "For best results, upload a mix of the following:\n\n"
+                "• Contracts (customer, supplier, licence)\n"
+                "• IPR documentation (patents, trademarks, copyright, trade secrets)\n"
+                "• Business plan or pitch deck\n"
+                "• Pricing or revenue model\n"
+                "• Process documents or SOPs\n"
+                "• Software, platform, or technical descriptions\n"
+                "• Customer or pipeline data\n"
+                "• Partnership or joint venture agreements\n"
+                "• ESG or sustainability documentation\n\n"
+                "The more structured and documented your evidence, the stronger your valuation, licensing, and tax-positioning outputs will be."
             )
 
-        with colv2:
-            exit_date = st.date_input(
-                "Suggested or expected exit date",
-                value=datetime.date(2027, 1, 1),
-                key="exit_date",
-                help="When do you expect a sale, investment, or restructuring event to take place?"
+            st.success("TTO / Netval quick-screening enabled: this tool helps identify whether assets are ready for licensing, co-creation, or knowledge transfer.")
+
+            uploads = st.file_uploader(
+                "Upload evidence (PDF, DOCX, TXT, CSV, XLSX, PPTX, images)",
+                type=["pdf", "docx", "txt", "csv", "xlsx", "pptx", "png", "jpg", "jpeg", "webp"],
+                accept_multiple_files=True,
+                key="uploader_main",
             )
-        # --- Q1: What are you working on? ---
-        q1_type_options = [
-            "New product",
-            "New service",
-            "Software / app",
-            "Online platform or portal",
-            "Training or learning content",
-            "Data or analytics",
-            "Method / process or toolkit",
-            "Brand / marketing concept",
-            "Other idea",
-        ]
-        q1_type = st.multiselect(
-            "1) What are you working on? *",
-            q1_type_options,
-            help="Tick all that apply. This can be a company, project, spin-out, or early idea.",
-        )
-        q1_desc = st.text_area(
-            "Short description (one or two sentences)",
-            ss.get("why_service", ""),
-            height=70,
-        )
 
-        # --- Q2: Where are you on the journey? ---
-        q2_stage_options = [
-            "Idea only / early concept",
-            "Prototype or proof-of-concept",
-            "Pilot with first users",
-            "First paying customers",
-            "Growing / scaling",
-            "Established product or service",
-        ]
-        q2_stage_choice = st.selectbox(
-            "2) Where are you on the journey right now? *",
-            q2_stage_options,
-            index=0,
-            help="Roughly where you are today — this doesn’t need to be perfect.",
-        )
-        q2_notes = st.text_area(
-            "Anything important about your current stage (optional)",
-            ss.get("stage", ""),
-            height=60,
-        )
+            submitted = st.form_submit_button("Save details")
+
+            if submitted:
+                # Build simple text answers from dropdowns + notes
+                # Q1
+                q1_parts = []
+                if q1_type:
+                    q1_parts.append("Types: " + ", ".join(q1_type))
+                if q1_desc.strip():
+                    q1_parts.append("Description: " + q1_desc.strip())
+                q1_what = " ".join(q1_parts).strip()
+
+                # Q2
+                q2_parts = [q2_stage_choice]
+                if q2_notes.strip():
+                    q2_parts.append(q2_notes.strip())
+                q2_text = " ".join(q2_parts).strip()
+
+                # Q3
+                q3_parts = []
+                if q3_users:
+                    q3_parts.append("Users: " + ", ".join(q3_users))
+                if q3_regions:
+                    q3_parts.append("Regions: " + ", ".join(q3_regions))
+                if q3_notes.strip():
+                    q3_parts.append("Notes: " + q3_notes.strip())
+                q3_text = " ".join(q3_parts).strip()
+
+                # Q4
+                q4_parts = []
+                if q4_assets:
+                    q4_parts.append("Assets already in place: " + ", ".join(q4_assets))
+                if q4_notes.strip():
+                    q4_parts.append("Other: " + q4_notes.strip())
+                q4_text = " ".join(q4_parts).strip()
+
+                # Q5
+                q5_parts = []
+                if q5_who:
+                    q5_parts.append("People / organisations involved: " + ", ".join(q5_who))
+                if q5_agreed:
+                    q5_parts.append("What’s agreed: " + ", ".join(q5_agreed))
+                if q5_notes.strip():
+                    q5_parts.append("Notes: " + q5_notes.strip())
+                q5_text = " ".join(q5_parts).strip()
+
+                # Q6
+                q6_parts = []
+                if q6_earn_sel:
+                    q6_parts.append("Revenue ideas: " + ", ".join(q6_earn_sel))
+                if q6_share_sel:
+                    q6_parts.append("Sharing / access: " + ", ".join(q6_share_sel))
+                if q6_notes.strip():
+                    q6_parts.append("Notes: " + q6_notes.strip())
+                q6_text = " ".join(q6_parts).strip()
+
+                # Per-file size check (also holds if the app runs without the repo's server config)
+                oversize = [f.name for f in uploads or [] if f.size > MAX_UPLOAD_MB * 1024 * 1024]
+
+                # Required fields check (six questions + name)
+                missing = [
+                    ("Company or project name", case_name),
+                    ("What are you working on?", q1_what),
+                    ("Where are you on the journey?", q2_text),
+                    ("Who should use this, and where?", q3_text),
+                    ("What you already have written down or built", q4_text),
+                    ("Who else is involved, and what’s agreed", q5_text),
+                    ("How you hope to earn from this, and what you’re happy to share", q6_text),
+                ]
+                missing_fields = [label for (label, val) in missing if not (val or "").strip()]
 
-        # --- Q3: Who should use this, and where? ---
-        q3_user_options = [
-            "Households / general public",
-            "Small businesses / SMEs",
-            "Large companies",
-            "Government / public bodies",
-            "Hospitals / clinics",
-            "Schools / universities",
-            "Farmers or producers",
-            "NGOs / community groups",
-            "Other (not listed)",
-        ]
-        q3_region_options = [
-            "Local only",
-            "National",
-            "Regional (e.g. EU, East Africa)",
-            "Across Africa",
-            "Across Europe",
-            "Global",
-        ]
-        q3_users = st.multiselect(
-            "3) Who do you want to use this? *",
-            q3_user_options,
-            help="Tick all that apply.",
-        )
-        q3_regions = st.multiselect(
-            "Where do you mainly want to use or sell it? *",
-            q3_region_options,
-        )
-        q3_notes = st.text_area(
-            "Key countries or regions (optional)",
-            ss.get("plan_s", ""),
-            height=60,
-        )
+                if missing_fields:
+                    st.error("Please complete required fields: " + ", ".join(missing_fields))
+                elif oversize:
+                    st.error(f"Over the {MAX_UPLOAD_MB}MB per-file limit — please split or compress: " + ", ".join(oversize))
+                else:
+                    # Store everything back into session (reuse existing keys)
+                    ss["case_name"] = case_name
+                    ss["company_size"] = size
+                    ss["company_type"] = company_type
+                    ss["sector"] = sector
 
-        # --- Q4: What do you already have written down or built? ---
-        q4_asset_options = [
-            "Nothing written down yet",
-            "Notes or concept document",
-            "Slides / pitch deck",
-            "Business plan or canvas",
-            "Prototype / demo",
-            "Working software / app",
-            "Datasets or analytics",
-            "Training or learning materials",
-            "Brand assets (name, logo, style)",
-            "Website or landing page",
-            "Policies, SOPs or manuals",
-            "Contracts or agreements",
-        ]
-        q4_assets = st.multiselect(
-            "4) What do you already have written down or built? *",
-            q4_asset_options,
-            help="Tick everything you already have. The documents themselves can be uploaded below.",
-        )
-        q4_notes = st.text_area(
-            "Anything else you have already created (optional)",
-            ss.get("plan_m", ""),
-            height=60,
-        )
+                    # Map to existing keys used by the analysis engine
+                    ss["why_service"] = q1_what
+                    ss["stage"] = q2_text
+                    ss["plan_s"] = q3_text
+                    ss["plan_m"] = q4_text
+                    ss["plan_l"] = q5_text
+                    ss["markets_why"] = q6_text
+                    # sale_price_why stays as-is / unused in this simplified licensing view
 
-        # --- Q5: Who else is involved, and what’s agreed? ---
-        q5_who_options = [
-            "Just me / us (founder team)",
-            "Co-founders",
-            "University or research institute",
-            "Current employer",
-            "Investor or funder",
-            "Customer / client",
-            "Supplier or tech partner",
-            "Government or public body",
-            "NGO / community group",
-            "Other partner",
-        ]
-        q5_agree_options = [
-            "Nothing formal yet",
-            "Informal discussions only",
-            "Emails that talk about roles or rights",
-            "NDA / confidentiality agreement",
-            "Grant agreement",
-            "Commercial contract",
-            "IP or licence agreement",
-            "Don’t know / need to check",
-        ]
-        q5_who = st.multiselect(
-            "5) Who else is involved? *",
-            q5_who_options,
-        )
-        q5_agreed = st.multiselect(
-            "What (if anything) has already been agreed in writing? *",
-            q5_agree_options,
-        )
-        q5_notes = st.text_area(
-            "Anything sensitive or important about these relationships (optional)",
-            ss.get("plan_l", ""),
-            height=60,
-        )
+                    # Clear legacy “full story” field (no longer used)
+                    ss["full_context_block"] = ""
+                    ss["auto_split_on_save"] = False
 
-        # --- Q6: How do you hope to earn from this, and what are you happy to share? ---
-        q6_earn_options = [
-            "One-off sales",
-            "Subscription (monthly or yearly)",
-            "Pay-per-use",
-            "Revenue share",
-            "Licence fees / royalties",
-            "Consulting or services",
-            "Advertising / sponsorship",
-            "Not sure yet",
-        ]
-        q6_share_options = [
-            "Keep fully private / closed",
-            "Only for paying customers",
-            "Lower-cost access for SMEs / start-ups",
-            "Free or low-cost for community / public sector",
-            "Open for non-commercial use",
-            "Open source (code or content)",
-            "Not sure yet",
-        ]
-        q6_earn_sel = st.multiselect(
-            "6) How do you hope to earn from this? *",
-            q6_earn_options,
-        )
-        q6_share_sel = st.multiselect(
-            "What are you happy to share or make easier to access? *",
-            q6_share_options,
-        )
-        q6_notes = st.text_area(
-            "Anything else about pricing, access or fairness (optional)",
-            ss.get("markets_why", ""),
-            height=60,
-        )
+                    if uploads:
+                        ss["uploads"] = uploads
 
-        st.caption("Uploads are held in session until analysis. Nothing is written to server until export.")
-        st.markdown("#### Suggested Evidence (for stronger results)")
-
-        st.info(
-            "For best results, upload a mix of the following:\n\n"
-            "• Contracts (customer, supplier, licence)\n"
-            "• IPR documentation (patents, trademarks, copyright, trade secrets)\n"
-            "• Business plan or pitch deck\n"
-            "• Pricing or revenue model\n"
-            "• Process documents or SOPs\n"
-            "• Software, platform, or technical descriptions\n"
-            "• Customer or pipeline data\n"
-            "• Partnership or joint venture agreements\n"
-            "• ESG or sustainability documentation\n\n"
-            "The more structured and documented your evidence, the stronger your valuation, licensing, and tax-positioning outputs will be."
-        )
-        
-        st.success("TTO / Netval quick-screening enabled: this tool helps identify whether assets are ready for licensing, co-creation, or knowledge transfer.")
-        
-        uploads = st.file_uploader(
-            "Upload evidence (PDF, DOCX, TXT, CSV, XLSX, PPTX, images)",
-            type=["pdf", "docx", "txt", "csv", "xlsx", "pptx", "png", "jpg", "jpeg", "webp"],
-            accept_multiple_files=True,
-            key="uploader_main",
-        )
+                    st.success("Saved company / project details and licensing context.")
 
-        submitted = st.form_submit_button("Save details")
-
-        if submitted:
-            # Build simple text answers from dropdowns + notes
-            # Q1
-            q1_parts = []
-            if q1_type:
-                q1_parts.append("Types: " + ", ".join(q1_type))
-            if q1_desc.strip():
-                q1_parts.append("Description: " + q1_desc.strip())
-            q1_what = " ".join(q1_parts).strip()
-
-            # Q2
-            q2_parts = [q2_stage_choice]
-            if q2_notes.strip():
-                q2_parts.append(q2_notes.strip())
-            q2_text = " ".join(q2_parts).strip()
-
-            # Q3
-            q3_parts = []
-            if q3_users:
-                q3_parts.append("Users: " + ", ".join(q3_users))
-            if q3_regions:
-                q3_parts.append("Regions: " + ", ".join(q3_regions))
-            if q3_notes.strip():
-                q3_parts.append("Notes: " + q3_notes.strip())
-            q3_text = " ".join(q3_parts).strip()
-
-            # Q4
-            q4_parts = []
-            if q4_assets:
-                q4_parts.append("Assets already in place: " + ", ".join(q4_assets))
-            if q4_notes.strip():
-                q4_parts.append("Other: " + q4_notes.strip())
-            q4_text = " ".join(q4_parts).strip()
-
-            # Q5
-            q5_parts = []
-            if q5_who:
-                q5_parts.append("People / organisations involved: " + ", ".join(q5_who))
-            if q5_agreed:
-                q5_parts.append("What’s agreed: " + ", ".join(q5_agreed))
-            if q5_notes.strip():
-                q5_parts.append("Notes: " + q5_notes.strip())
-            q5_text = " ".join(q5_parts).strip()
-
-            # Q6
-            q6_parts = []
-            if q6_earn_sel:
-                q6_parts.append("Revenue ideas: " + ", ".join(q6_earn_sel))
-            if q6_share_sel:
-                q6_parts.append("Sharing / access: " + ", ".join(q6_share_sel))
-            if q6_notes.strip():
-                q6_parts.append("Notes: " + q6_notes.strip())
-            q6_text = " ".join(q6_parts).strip()
-
-            # Required fields check (six questions + name)
-            missing = [
-                ("Company or project name", case_name),
-                ("What are you working on?", q1_what),
-                ("Where are you on the journey?", q2_text),
-                ("Who should use this, and where?", q3_text),
-                ("What you already have written down or built", q4_text),
-                ("Who else is involved, and what’s agreed", q5_text),
-                ("How you hope to earn from this, and what you’re happy to share", q6_text),
-            ]
-            missing_fields = [label for (label, val) in missing if not (val or "").strip()]
+        if ss.get("uploads"):
+            st.info(f"{len(ss['uploads'])} file(s) stored in session. Go to **Analyse Evidence** next.")
+
+    _company_form()
 
-            if missing_fields:
-                st.error("Please complete required fields: " + ", ".join(missing_fields))
-            else:
-                # Store everything back into session (reuse existing keys)
-                ss["case_name"] = case_name
-                ss["company_size"] = size
-                ss["company_type"] = company_type
-                ss["sector"] = sector
-
-                # Map to existing keys used by the analysis engine
-                ss["why_service"] = q1_what
-                ss["stage"] = q2_text
-                ss["plan_s"] = q3_text
-                ss["plan_m"] = q4_text
-                ss["plan_l"] = q5_text
-                ss["markets_why"] = q6_text
-                # sale_price_why stays as-is / unused in this simplified licensing view
-
-                # Clear legacy “full story” field (no longer used)
-                ss["full_context_block"] = ""
-                ss["auto_split_on_save"] = False
-
-                if uploads:
-                    ss["uploads"] = uploads
-
-                st.success("Saved company / project details and licensing context.")
-
-    if ss.get("uploads"):
-        st.info(f"{len(ss['uploads'])} file(s) stored in session. Go to **Analyse Evidence** next.")
-        
 # 2) ANALYSE EVIDENCE (with radar / evidence quality)
 elif page == "Analyse Evidence":
     st.header("Evidence Dashboard & Analysis")
@@ -1534,9 +2053,7 @@ elif page == "Analyse Evidence":
 
         counts = ss.get("file_counts", {}) or {}
         if counts:
-            st.markdown("**Files by type (session):**")
-            for ext, n in counts.items():
-                st.markdown(f"- `{ext}` → {n} file(s)")
+            st.markdown(_format_file_counts_md(tuple(counts.items())))
         else:
             st.caption("No files analysed yet.")
 
@@ -1562,20 +2079,18 @@ elif page == "Analyse Evidence":
         st.subheader("IC Radar (4-Leaf + Ten-Steps)")
 
         ic_map: Dict[str, Any] = ss.get("ic_map", {})
-        ten = ss.get(
-            "ten_steps",
-            {"scores": [5] * len(TEN_STEPS), "narratives": [f"{s}: tbd" for s in TEN_STEPS]},
-        )
+        ten = ss["ten_steps"]
 
-        leaf_labels = ["Human", "Structural", "Customer", "Strategic Alliance"]
-        leaf_vals = [float(ic_map.get(l, {}).get("score", 0.0)) for l in leaf_labels]
+        leaf_vals = [float(ic_map.get(l, {}).get("score", 0.0)) for l in LEAF_LABELS]
 
         if any(v > 0 for v in leaf_vals):
+            import plotly.graph_objects as go  # radar only; imported on first draw
+
             fig_leaf = go.Figure()
             fig_leaf.add_trace(
                 go.Scatterpolar(
                     r=leaf_vals + leaf_vals[:1],
-                    theta=leaf_labels + leaf_labels[:1],
+                    theta=[*LEAF_LABELS, LEAF_LABELS[0]],
                     fill="toself",
                     name="IC Intensity",
                 )
@@ -1589,80 +2104,108 @@ elif page == "Analyse Evidence":
         else:
             st.caption("Radar will appear once analysis has been run and IC signals are detected.")
 
-        step_scores = ten.get("scores") or [5] * len(TEN_STEPS)
+        step_scores = ten["scores"]
         if step_scores:
-            fig_steps = go.Figure(
-                data=[
-                    go.Bar(
-                        x=TEN_STEPS,
-                        y=step_scores,
-                    )
-                ]
+            # Plain Vega-Lite bar (bundled with Streamlit); keeps TEN_STEPS order and a 0–10 axis
+            st.vega_lite_chart(
+                spec={
+                    "data": {"values": [{"step": s, "score": v} for s, v in zip(TEN_STEPS, step_scores)]},
+                    "mark": "bar",
+                    "encoding": {
+                        "x": {"field": "step", "type": "nominal", "sort": None, "title": None},
+                        "y": {"field": "score", "type": "quantitative", "scale": {"domain": [0, 10]}, "title": None},
+                    },
+                },
+                use_container_width=True,
             )
-            fig_steps.update_layout(
-                yaxis=dict(range=[0, 10]),
-                margin=dict(l=20, r=20, t=20, b=40),
-            )
-            st.plotly_chart(fig_steps, use_container_width=True)
 
     st.markdown("---")
     st.subheader("Interpreted Analysis Summary (first 5000 chars)")
-    combined = ss.get("combined_text", "")
-    st.text_area(
-        "Summary view (read-only; editable in LIP Console)",
-        combined[:5000],
-        height=260,
-        key="combined_preview",
-    )
+    # Static text, not a widget: nothing to sync back from the browser on reruns
+    st.caption("Summary view (read-only; editable in LIP Console)")
+    with st.container(height=260):
+        st.text(ss.get("combined_preview_text") or ss.get("combined_text", "")[:5000])
 
     if st.button("Run analysis now"):
         uploads: List[Any] = ss.get("uploads") or []
-        extracted, counts, weights = _read_text(uploads)
+        # Per-file progress while uploads are parsed; cleared once the text is in
+        read_bar = st.progress(0.0, text="Reading uploads…") if uploads else None
+        chunks, counts, weights = _read_text(uploads, progress=read_bar)
+        if read_bar is not None:
+            read_bar.empty()
 
         ss["file_counts"] = counts or {}
 
-        context = {
-            "why": ss.get("why_service", ""),
-            "stage": ss.get("stage", ""),
-            "plan_s": ss.get("plan_s", ""),
-            "plan_m": ss.get("plan_m", ""),
-            "plan_l": ss.get("plan_l", ""),
-            "markets": ss.get("markets_why", ""),
-            "sale": ss.get("sale_price_why", ""),
-        }
-
-        context_stub = (
-            f"[CTX] why={context['why'][:140]} | stage={context['stage'][:140]} | "
-            f"plans=({context['plan_s'][:60]}/{context['plan_m'][:60]}/{context['plan_l'][:60]}) | "
-            f"markets={context['markets'][:140]} | sale={context['sale'][:60]}"
-        )
-
-        combined_text_for_detection = (extracted + "\n\n" + context_stub).strip().lower()
-
-        ic_map, leaf_scores, ten, quality = _analyse_weighted(combined_text_for_detection, weights)
-
+        context, context_stub = _analysis_context()
+        # Case details read once for the signature, the scan and the summary
+        # (each session_state lookup goes through Streamlit's state proxy)
         case = ss.get("case_name", "Untitled Company")
-        interpreted = _build_interpreted_summary(case, leaf_scores, ic_map, ten, quality, context)
+        sector = ss.get("sector", "Other")
+        size = ss.get("company_size", "Micro (1–10)")
+
+        # Each upload section and the [CTX] stub are scanned as separate parts (never concatenated)
+        detection_parts = (*chunks, context_stub)
+
+        # One digest per scanned part: cache keys for the cue scan and _analyse_weighted, and
+        # part of the run signature. sha256 runs on the CPU's SHA extensions (~1 GB/s, about
+        # 2.5x blake2b on multi-MB text)
+        part_keys = tuple(hashlib.sha256(part.encode("utf-8")).hexdigest() for part in detection_parts)
+
+        # Identical evidence + context + case details as last run → keep current results.
+        # Every context field goes in at full length: the [CTX] stub is truncated, but
+        # the interpreted summary reads the whole why/markets text
+        sig_hash = hashlib.blake2b(digest_size=16)
+        for part in (
+            *part_keys,
+            repr(sorted(weights.items())),
+            *(getattr(context, field) for field, _ in CONTEXT_FIELDS),
+            case,
+            sector,
+            size,
+        ):
+            sig_hash.update(part.encode("utf-8"))
+            sig_hash.update(b"\x1f")
+        sig = sig_hash.hexdigest()
+
+        if ss.get("_last_analysis_sig") == sig and ss.get("ic_map"):
+            st.info("Evidence and company context are unchanged since the last run — keeping the current analysis.")
+        else:
+            with st.spinner("Scanning evidence for IC signals…"):
+                ic_map, leaf_scores, ten, quality = _analyse_weighted(part_keys, detection_parts, weights, sector)
+
+            interpreted = _build_interpreted_summary(
+                case,
+                sector,
+                size,
+                leaf_scores,
+                ic_map,
+                ten,
+                quality,
+                context,
+            )
 
-        ss["combined_text"] = interpreted
-        ss["narrative"] = interpreted
-        try:
-            st.session_state["persist_narrative"] = interpreted
-        except Exception:
-            pass
+            ss["combined_text"] = interpreted
+            ss["combined_preview_text"] = interpreted[:5000]
+            ss["narrative"] = interpreted
+            try:
+                st.session_state["persist_narrative"] = interpreted
+            except Exception:
+                pass
 
-        ss["ic_map"] = ic_map
-        ss["ten_steps"] = ten
-        ss["leaf_scores"] = leaf_scores
-        ss["evidence_quality"] = quality
+            ss["ic_map"] = ic_map
+            ss["ten_steps"] = ten
+            ss["leaf_scores"] = leaf_scores
+            ss["evidence_quality"] = quality
 
-        if len(extracted.strip()) < 100:
-            st.warning(
-                "Little machine-readable text was extracted (DOCX/PPTX/CSV extraction is enabled). "
-                "If PDFs dominate, consider adding a brief TXT note or export key pages to DOCX."
-            )
+            if sum(len(chunk) for chunk in chunks) < 100:
+                st.warning(
+                    "Little machine-readable text was extracted (DOCX/PPTX/CSV extraction is enabled). "
+                    "If PDFs dominate, consider adding a brief TXT note or export key pages to DOCX."
+                )
+
+            ss["_last_analysis_sig"] = sig
 
-        st.success("Analysis complete. Open **LIP Console** to refine and export.")
+            st.success("Analysis complete. Open **LIP Console** to refine and export.")
 
 #3)Asset Verification 
 elif page == "Asset Verification":
@@ -1744,15 +2287,26 @@ elif page == "LIP Console":
             "Run Analyse Evidence first to populate the LIP Console."
         )
 
-    nar = st.text_area(
-        "Summary (editable by Licensing & Intangibles Partner)",
-        value=narrative,
-        height=220,
-        key="nar_edit",
-    )
+    @st.fragment
+    def _narrative_editor(narrative: str) -> None:
+        """
+        Editable summary. Edits are applied on "Apply edits" only, and the
+        fragment keeps that submit from re-running the rest of the console.
+        """
+        with st.form("nar_edit_form", border=False):
+            nar = st.text_area(
+                "Summary (editable by Licensing & Intangibles Partner)",
+                value=narrative,
+                height=220,
+                key="nar_edit",
+            )
+            if st.form_submit_button("Apply edits"):
+                ss["narrative"] = nar or ss.get("narrative", "")
+                ss["combined_text"] = ss["narrative"]
+                ss["combined_preview_text"] = ss["narrative"][:5000]
+                st.success("Narrative updated.")
 
-    ss["narrative"] = nar or ss.get("narrative", "")
-    ss["combined_text"] = ss["narrative"]
+    _narrative_editor(narrative)
 
     colA, colB = st.columns([1, 1])
 
@@ -1764,15 +2318,17 @@ elif page == "LIP Console":
 
         st.subheader("4-Leaf Map")
         ic_map: Dict[str, Any] = ss.get("ic_map", {})
-        for leaf in ["Human", "Structural", "Customer", "Strategic Alliance"]:
+        leaf_lines: List[str] = []
+        for leaf in LEAF_LABELS:
             row = ic_map.get(
                 leaf,
                 {"tick": False, "narrative": f"No assessment yet for {leaf}.", "score": 0.0},
             )
             tick = "✓" if row["tick"] else "•"
             suffix = "" if PUBLIC_MODE else f"  _(score: {row.get('score', 0.0)})_"
-            st.markdown(f"- **{leaf}**: {tick}{suffix}")
-            st.caption(row["narrative"])
+            leaf_lines.append(f"- **{leaf}**: {tick}{suffix}  \n  :gray[{row['narrative']}]")
+        # One markdown block for the whole map (one delta instead of two per leaf)
+        st.markdown("\n".join(leaf_lines))
 
         st.subheader("Netval / TTO Badge")
         netval_score = 0
@@ -1805,9 +2361,8 @@ elif page == "LIP Console":
 
     with colB:
         st.subheader("Ten-Steps Readiness")
-        raw_ten = ss.get("ten_steps") or {}
-        scores = raw_ten.get("scores") or [5] * len(TEN_STEPS)
-        narrs = raw_ten.get("narratives") or [f"{s}: tbd" for s in TEN_STEPS]
+        scores = ss["ten_steps"]["scores"]
+        narrs = ss["ten_steps"]["narratives"]
 
         st.dataframe(
             {"Step": TEN_STEPS, "Score (1–10)": scores},
@@ -1816,34 +2371,34 @@ elif page == "LIP Console":
         )
 
         with st.expander("Narrative per step"):
-            for s, n in zip(TEN_STEPS, narrs):
-                st.markdown(f"**{s}** — {n}")
+            st.markdown(_format_ten_steps_md(tuple(TEN_STEPS), tuple(narrs)))
 
         st.subheader("Company Context")
-        st.markdown(f"- **Company / project:** {ss.get('case_name', '') or '—'}")
-        st.markdown(f"- **Sector:** {ss.get('sector', '') or '—'}")
-        st.markdown(f"- **Size:** {ss.get('company_size', '') or '—'}")
-        st.markdown(f"- **Why service:** {ss.get('why_service', '') or '—'}")
-        st.markdown(f"- **Stage:** {ss.get('stage', '') or '—'}")
-        st.markdown(f"- **Markets / users:** {ss.get('markets_why', '') or '—'}")
+        st.markdown(
+            f"- **Company / project:** {ss.get('case_name', '') or '—'}\n"
+            f"- **Sector:** {ss.get('sector', '') or '—'}\n"
+            f"- **Size:** {ss.get('company_size', '') or '—'}\n"
+            f"- **Why service:** {ss.get('why_service', '') or '—'}\n"
+            f"- **Stage:** {ss.get('stage', '') or '—'}\n"
+            f"- **Markets / users:** {ss.get('markets_why', '') or '—'}"
+        )
 
         st.subheader("LIP Suggested Next Moves")
-        st.markdown("- Review whether Structural Capital is sufficient for licensing.")
-        st.markdown("- Confirm whether the evidence supports FRAND, co-creation, or knowledge licensing.")
-        st.markdown("- Check whether valuation support and tax-positioning outputs are ready for reporting.")
+        st.markdown(
+            "- Review whether Structural Capital is sufficient for licensing.\n"
+            "- Confirm whether the evidence supports FRAND, co-creation, or knowledge licensing.\n"
+            "- Check whether valuation support and tax-positioning outputs are ready for reporting."
+        )
  
 # 5) REPORTS
 elif page == "Reports":
     st.header("Reports & Exports")
-    case_folder = OUT_ROOT / _safe(ss.get("case_name", "Untitled Company"))
+    case_folder = _case_folder(ss.get("case_name", "Untitled Company"))
 
     def _report_context() -> Dict[str, Any]:
         ic_map = ss.get("ic_map", {}) or {}
 
-        raw_ten = ss.get("ten_steps") or {}
-        scores = raw_ten.get("scores") or [5] * len(TEN_STEPS)
-        narrs = raw_ten.get("narratives") or [f"{s}: readiness ≈ 5/10." for s in TEN_STEPS]
-        ten = {"scores": scores, "narratives": narrs}
+        ten = ss["ten_steps"]
 
         case_name = (ss.get("case_name") or "").strip()
         sector = (ss.get("sector") or "").strip()
@@ -1922,83 +2477,76 @@ elif page == "Reports":
         ctx = _report_context()
         title = f"IC Report — {ctx['case_name']}"
 
-        b: List[str] = []
-        b.append("Executive Summary\n")
-        if ctx["interpreted"]:
-            b.append(ctx["interpreted"])
-        else:
-            b.append(
-                f"{ctx['case_name']} is a {ctx['company_size']} in {ctx['sector']}. "
-                f"Evidence suggests relative strength in {ctx['strength_text']}."
-            )
-
-        b.append(f"\nEvidence Quality: ~{ctx['evidence_quality']}% coverage (heuristic).\n")
-
-        b.append("Four-Leaf Analysis")
-        for leaf in ["Human", "Structural", "Customer", "Strategic Alliance"]:
+        def leaf_line(leaf: str) -> str:
             row = ctx["ic_map"].get(
                 leaf,
                 {"tick": False, "narrative": f"No assessment yet for {leaf}.", "score": 0.0},
             )
             tick = "✓" if row.get("tick") else "•"
-            score = row.get("score", 0.0)
-            tail = "" if PUBLIC_MODE else f" (score: {score})"
-            b.append(f"- {leaf}: {tick} — {row.get('narrative', '')}{tail}")
+            tail = "" if PUBLIC_MODE else f" (score: {row.get('score', 0.0)})"
+            return f"- {leaf}: {tick} — {row.get('narrative', '')}{tail}"
 
-        b.append("\nTen-Steps Readiness")
-        for step, score, nar in zip(TEN_STEPS, ctx["ten"]["scores"], ctx["ten"]["narratives"]):
-            b.append(f"- {step}: readiness ≈ {score}/10. {nar}")
-
-        b.append("\nAreopa Valuation Model (Confidential Framework)")
-        b.append(
-            "This section is intentionally structured to allow the insertion of a detailed valuation table, "
-            "supporting figures, and a full explanation of the Areopa proprietary methodology."
+        leaf_lines = "\n".join(leaf_line(leaf) for leaf in LEAF_LABELS)
+        step_lines = "\n".join(
+            f"- {step}: readiness ≈ {score}/10. {nar}"
+            for step, score, nar in zip(TEN_STEPS, ctx["ten"]["scores"], ctx["ten"]["narratives"])
         )
-        b.append(
-            "The valuation approach is based on a structured mathematical framework comprising:"
+        summary = ctx["interpreted"] or (
+            f"{ctx['case_name']} is a {ctx['company_size']} in {ctx['sector']}. "
+            f"Evidence suggests relative strength in {ctx['strength_text']}."
         )
-        b.append("• 77 valuation formulas")
-        b.append("• 920 parameters")
-        b.append(
-            "\nThese parameters assess multiple dimensions including technical robustness, legal enforceability, "
-            "structural completeness, market alignment, and risk exposure / adjustment."
+        position = (
+            "- Relative position: stronger than a purely concept-stage company because explicit artefacts are already visible."
+            if ctx["structural_row"].get("tick")
+            else "- Relative position: still closer to an early-stage business because explicit Structural Capital remains under-documented."
         )
-        b.append(
-            "The detailed mechanics of this model are proprietary and are not generated automatically by this tool. "
-            "They should be inserted manually as part of an audit-grade valuation process."
+        disclaimer = (
+            "Advisory only. Not legal, tax, or accounting advice."
+            if PUBLIC_MODE
+            else "CONFIDENTIAL. Advisory-first; company and LIP review required for final scoring, licensing design, valuation treatment, and any accounting or tax use."
         )
-        b.append(">>> INSERT TABLES, VALUATION FIGURES, AND FULL METHODOLOGY EXPLANATION HERE <<<")
 
-        b.append("\nMarket Comparison")
-        b.append(
-            "This company is compared qualitatively against peers on the basis of evidence strength, "
-            "Structural Capital maturity, customer traction, partnership depth, licensing readiness, "
-            "and ability to convert tacit value into explicit, auditable assets."
-        )
-        if ctx["structural_row"].get("tick"):
-            b.append("- Relative position: stronger than a purely concept-stage company because explicit artefacts are already visible.")
-        else:
-            b.append("- Relative position: still closer to an early-stage business because explicit Structural Capital remains under-documented.")
+        body = f"""Executive Summary
 
-        b.append("\nAction Plan")
-        b.append("Top 3 Actions:")
-        b.append("1. Consolidate explicit artefacts into an audit-ready IA / IC register")
-        b.append("2. Strengthen weaker Ten-Steps areas through documented governance, monitoring, and reporting")
-        b.append("3. Convert more tacit knowledge into codified Structural Capital suitable for licensing and valuation")
+{summary}
 
-        b.append("\nNext Steps:")
-        b.append("• Build or refresh the asset register")
-        b.append("• Strengthen documentation, controls, and governance evidence")
-        b.append("• Move towards licensing, investor readiness, or valuation uplift using explicit artefacts")
+Evidence Quality: ~{ctx['evidence_quality']}% coverage (heuristic).
 
-        b.append("\nDisclaimer")
-        b.append(
-            "Advisory only. Not legal, tax, or accounting advice."
-            if PUBLIC_MODE
-            else "CONFIDENTIAL. Advisory-first; company and LIP review required for final scoring, licensing design, valuation treatment, and any accounting or tax use."
-        )
+Four-Leaf Analysis
+{leaf_lines}
 
-        return title, "\n".join(b)
+Ten-Steps Readiness
+{step_lines}
+
+Areopa Valuation Model (Confidential Framework)
+This section is intentionally structured to allow the insertion of a detailed valuation table, supporting figures, and a full explanation of the Areopa proprietary methodology.
+The valuation approach is based on a structured mathematical framework comprising:
+• 77 valuation formulas
+• 920 parameters
+
+These parameters assess multiple dimensions including technical robustness, legal enforceability, structural completeness, market alignment, and risk exposure / adjustment.
+The detailed mechanics of this model are proprietary and are not generated automatically by this tool. They should be inserted manually as part of an audit-grade valuation process.
+>>> INSERT TABLES, VALUATION FIGURES, AND FULL METHODOLOGY EXPLANATION HERE <<<
+
+Market Comparison
+This company is compared qualitatively against peers on the basis of evidence strength, Structural Capital maturity, customer traction, partnership depth, licensing readiness, and ability to convert tacit value into explicit, auditable assets.
+{position}
+
+Action Plan
+Top 3 Actions:
+1. Consolidate explicit artefacts into an audit-ready IA / IC register
+2. Strengthen weaker Ten-Steps areas through documented governance, monitoring, and reporting
+3. Convert more tacit knowledge into codified Structural Capital suitable for licensing and valuation
+
+Next Steps:
+• Build or refresh the asset register
+• Strengthen documentation, controls, and governance evidence
+• Move towards licensing, investor readiness, or valuation uplift using explicit artefacts
+
+Disclaimer
+{disclaimer}"""
+
+        return title, body
 
     def _compose_lic() -> Tuple[str, str]:
         ctx = _report_context()
@@ -2252,44 +2800,17 @@ elif page == "Reports":
     with c1:
         if st.button("Generate IC Report (DOCX/TXT)", key="btn_ic"):
             title, body = _compose_ic()
-            data, fname, mime = _export_bytes(title, body)
-            path, msg = _save_bytes(case_folder, fname, data)
-            st.download_button(
-                label="Download IC Report",
-                data=data,
-                file_name=fname,
-                mime=mime,
-                key="dl_ic",
-            )
-            (st.success if path else st.warning)(msg)
+            _offer_export(case_folder, title, body, "Download IC Report", key="dl_ic")
 
     with c2:
         if st.button("Generate Licensing Report (DOCX/TXT)", key="btn_lic"):
             title, body = _compose_lic()
-            data, fname, mime = _export_bytes(title, body)
-            path, msg = _save_bytes(case_folder, fname, data)
-            st.download_button(
-                label="Download Licensing Report",
-                data=data,
-                file_name=fname,
-                mime=mime,
-                key="dl_lic",
-            )
-            (st.success if path else st.warning)(msg)
+            _offer_export(case_folder, title, body, "Download Licensing Report", key="dl_lic")
 
     with c3:
         if st.button("Generate Belgian Tax Report (DOCX/TXT)", key="btn_tax"):
             title, body = _compose_tax()
-            data, fname, mime = _export_bytes(title, body)
-            path, msg = _save_bytes(case_folder, fname, data)
-            st.download_button(
-                label="Download Tax Report",
-                data=data,
-                file_name=fname,
-                mime=mime,
-                key="dl_tax",
-            )
-            (st.success if path else st.warning)(msg)
+            _offer_export(case_folder, title, body, "Download Tax Report", key="dl_tax")
 
     st.caption(
         "Server save root: disabled (public mode)"
@@ -2400,17 +2921,7 @@ elif page == "Licensing Templates":
                 "   - Mechanism for addressing disputes.\n"
             )
 
-        data, fname, mime = _export_bytes(title, body)
-        folder = OUT_ROOT / _safe(case)
-        path, msg = _save_bytes(folder, fname, data)
-        st.download_button(
-            "⬇️ Download Template",
-            data,
-            file_name=fname,
-            mime=mime,
-            key="dl_tpl",
-        )
-        (st.success if path else st.warning)(msg)
+        _offer_export(_case_folder(case), title, body, "⬇️ Download Template", key="dl_tpl")
 
 # 7) LIP ASSISTANT (beta)
 elif page == "LIP Assistant":
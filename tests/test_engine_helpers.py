@@ -0,0 +1,221 @@
+# tests/test_engine_helpers.py — baseline-equivalence checks for the pure engine helpers
+# The apps are Streamlit scripts (they render pages at import), so each test namespace is
+# built from an app's import preamble plus its EVIDENCE EXTRACTION and CUE SCANNER
+# sections only. Expected values are what the original python-docx / python-pptx /
+# substring-scan code produced for the same inputs.
+
+import io
+import zipfile
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+ROOT = Path(__file__).resolve().parents[1]
+APPS = ("app_clean.py", "app_clean_vm.py")
+
+
+def _load_helpers(app: str) -> Dict[str, Any]:
+    """Exec an app's preamble and helper sections (line numbers kept for tracebacks)."""
+    src = (ROOT / app).read_text(encoding="utf-8")
+    theme = src.index("# ------------------ THEME")
+    start = src.index("# --------------- EVIDENCE EXTRACTION")
+    end = src.index("# --------------- ANALYSIS ENGINE")
+    code = src[:theme] + "\n" * src.count("\n", theme, start) + src[start:end]
+    ns: Dict[str, Any] = {"__name__": Path(app).stem, "__file__": str(ROOT / app)}
+    exec(compile(code, str(ROOT / app), "exec"), ns)
+    return ns
+
+
+@pytest.fixture(scope="module", params=APPS)
+def helpers(request) -> Dict[str, Any]:
+    return _load_helpers(request.param)
+
+
+# --------------- CUE SCANNER -------------------------
+CUE_TEXTS = [
+    "",
+    "signed mou and jv agreement; sop for health and safety, esg report to the board",
+    "our contractors follow the joint  venture protocol",
+    "joint\nventure with the university; customer crm and pipeline",
+    "team\ttraining\r\ncompetency matrix — biodiversity & emissions",
+]
+
+
+@pytest.mark.parametrize("automaton", [False, True], ids=["substring", "ahocorasick"])
+def test_cue_hits_match_substring_scan(helpers, monkeypatch, automaton):
+    if automaton:
+        pytest.importorskip("ahocorasick")
+        monkeypatch.setitem(helpers, "CUE_AUTOMATON", helpers["_build_cue_automaton"](helpers["ALL_CUES"]))
+    else:
+        monkeypatch.setitem(helpers, "CUE_AUTOMATON", None)
+    all_cues = helpers["ALL_CUES"]
+    for text in CUE_TEXTS + [" ".join(all_cues)]:
+        # Baseline: one `cue in text` test per cue
+        assert helpers["_cue_hits"](text) == frozenset(c for c in all_cues if c in text), text
+
+
+@pytest.mark.parametrize("automaton", [False, True], ids=["substring", "ahocorasick"])
+def test_cue_hits_phrases_need_exact_spacing(helpers, monkeypatch, automaton):
+    if automaton:
+        pytest.importorskip("ahocorasick")
+        monkeypatch.setitem(helpers, "CUE_AUTOMATON", helpers["_build_cue_automaton"](helpers["ALL_CUES"]))
+    else:
+        monkeypatch.setitem(helpers, "CUE_AUTOMATON", None)
+    phrase = next(c for c in helpers["ALL_CUES"] if " " in c)
+    spaced = phrase.replace(" ", "  ")
+    assert phrase in helpers["_cue_hits"](f"x {phrase} y")
+    assert phrase not in helpers["_cue_hits"](f"x {spaced} y")
+
+
+# --------------- FILE NAME WEIGHTS -------------------
+@pytest.mark.parametrize(
+    "name, ext, expected",
+    [
+        ("jv_contract.pdf", ".pdf", 1.0),
+        ("process_spec.docx", ".docx", 0.8),
+        ("board_pack_q3.pptx", ".pptx", 0.8),
+        ("team_culture.txt", ".txt", 0.5),
+        ("pricing.csv", ".csv", 0.7),
+        ("notes.xyz", ".xyz", 0.4),
+        ("licence register.docx", ".docx", 0.9),
+    ],
+)
+def test_name_weight(helpers, name, ext, expected):
+    assert helpers["_name_weight"](name, ext) == expected
+
+
+def test_name_weight_matches_baseline_loop(helpers):
+    # Baseline: start from the extension default, take the max over every cue in the name
+    cues = [c for c, _ in helpers["NAME_WEIGHTS"]]
+    names = [a + sep + b for a in cues for b in cues for sep in ("_", "")] + cues
+    for name in names:
+        for ext in (".docx", ".pptx", ".txt", ".csv", ".pdf", "none"):
+            expected = max(
+                [helpers["EXT_DEFAULTS"].get(ext, 0.4)] + [w for c, w in helpers["NAME_WEIGHTS"] if c in name]
+            )
+            assert helpers["_name_weight"](name, ext) == expected, (name, ext)
+
+
+# --------------- DOCX / PPTX XML READERS -------------
+W_DOC = (
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><w:body>'
+    '<w:p><w:r><w:t xml:space="preserve">Master Services </w:t></w:r>'
+    '<w:hyperlink r:id="rId9"><w:r><w:t>Agreement</w:t></w:r></w:hyperlink></w:p>'
+    "<w:p><w:r><w:t>Tab</w:t><w:tab/><w:t>bed</w:t><w:br/><w:t>line</w:t>"
+    '<w:noBreakHyphen/><w:t>x</w:t><w:br w:type="page"/></w:r></w:p>'
+    '<w:p><w:ins w:id="1" w:author="a"><w:r><w:t>inserted</w:t></w:r></w:ins>'
+    "<w:r><w:t>  kept  </w:t></w:r></w:p>"
+    "<w:p/>"
+    "<w:tbl><w:tr>"
+    "<w:tc><w:p><w:r><w:t>SOP</w:t></w:r></w:p></w:tc>"
+    "<w:tc><w:p><w:r><w:t>Safety</w:t></w:r></w:p><w:p><w:r><w:t>Policy</w:t></w:r></w:p></w:tc>"
+    "</w:tr><w:tr><w:tc><w:p/></w:tc><w:tc><w:p/></w:tc></w:tr></w:tbl>"
+    "<w:sectPr/></w:body></w:document>"
+)
+
+P_NS = (
+    'xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+)
+RELS = '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{}</Relationships>'
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+
+
+def _zip(parts: Dict[str, str]) -> io.BytesIO:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as z:
+        for name, xml in parts.items():
+            z.writestr(name, xml)
+    buf.seek(0)
+    return buf
+
+
+def _sp(paras, ph: str = "") -> str:
+    """One p:sp text shape; ph is an optional p:ph placeholder element."""
+    body = "".join(f"<a:p>{p}</a:p>" for p in paras)
+    return (
+        f'<p:sp><p:nvSpPr><p:cNvPr id="1" name="s"/><p:cNvSpPr/><p:nvPr>{ph}</p:nvPr></p:nvSpPr>'
+        f"<p:spPr/><p:txBody><a:bodyPr/>{body}</p:txBody></p:sp>"
+    )
+
+
+def _sp_tree(shapes: str) -> str:
+    return (
+        '<p:cSld><p:spTree><p:nvGrpSpPr><p:cNvPr id="0" name=""/><p:cNvGrpSpPr/><p:nvPr/>'
+        f"</p:nvGrpSpPr><p:grpSpPr/>{shapes}</p:spTree></p:cSld>"
+    )
+
+
+def test_docx_xml_text(helpers):
+    package = _zip({"word/document.xml": W_DOC})
+    # python-docx: paragraph text (hyperlink runs in, w:ins runs out, page break dropped), then table rows
+    assert helpers["_docx_xml_text"](package) == (
+        "Master Services Agreement\nTab\tbed\nline-x\nkept\nSOP | Safety\nPolicy\n | "
+    )
+
+
+def test_pptx_xml_text(helpers):
+    package = _zip(
+        {
+            "ppt/presentation.xml": f'<p:presentation {P_NS}><p:sldIdLst><p:sldId id="257" r:id="rId3"/>'
+            '<p:sldId id="256" r:id="rId2"/></p:sldIdLst></p:presentation>',
+            "ppt/_rels/presentation.xml.rels": RELS.format(
+                f'<Relationship Id="rId2" Type="{REL_TYPE}slide" Target="slides/slide1.xml"/>'
+                f'<Relationship Id="rId3" Type="{REL_TYPE}slide" Target="slides/slide2.xml"/>'
+            ),
+            "ppt/slides/slide1.xml": f"<p:sld {P_NS}>"
+            + _sp_tree(
+                _sp(["<a:r><a:t>Board pack</a:t></a:r>"])
+                + _sp(
+                    [
+                        "<a:r><a:t>Line</a:t></a:r><a:br/><a:r><a:t>break</a:t></a:r>",
+                        '<a:fld id="{1}" type="slidenum"><a:t>1</a:t></a:fld>',
+                    ]
+                )
+                + _sp(["<a:r><a:t>   </a:t></a:r>"])
+            )
+            + "</p:sld>",
+            "ppt/slides/_rels/slide1.xml.rels": RELS.format(
+                f'<Relationship Id="rId1" Type="{REL_TYPE}notesSlide" Target="../notesSlides/notesSlide1.xml"/>'
+            ),
+            "ppt/notesSlides/notesSlide1.xml": f"<p:notes {P_NS}>"
+            + _sp_tree(
+                _sp(["<a:r><a:t>not notes</a:t></a:r>"], '<p:ph type="sldImg"/>')
+                + _sp(["<a:r><a:t>Speaker notes</a:t></a:r>"], '<p:ph type="body" idx="1"/>')
+            )
+            + "</p:notes>",
+            "ppt/slides/slide2.xml": f"<p:sld {P_NS}>"
+            + _sp_tree(_sp(["<a:r><a:t>First in order</a:t></a:r>"]))
+            + "</p:sld>",
+            "ppt/slides/_rels/slide2.xml.rels": RELS.format(""),
+        }
+    )
+    # python-pptx: slides in sldIdLst order, shape text frames (a:br as \v), then the notes body
+    assert helpers["_pptx_xml_text"](package) == "First in order\nBoard pack\nLine\vbreak\n1\nSpeaker notes"
+
+
+# --------------- CSV EXTRACTION ----------------------
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (b"a,b\n1,2\n", "CSV:t.csv\nHeaders: a, b\nRows: 1; 2"),
+        (b'\xef\xbb\xbfh1, h2 ,,\r\nx,"y, z"\r\n', "CSV:t.csv\nHeaders: \ufeffh1, h2\nRows: x; y, z"),
+        (b'h\n"multi\nline",q\n', "CSV:t.csv\nHeaders: h\nRows: multiline; q"),
+        (b"a\rb\rc", "CSV:t.csv\nHeaders: a\nRows: b; c"),
+        (b"\n\nh\n", "CSV:t.csv\nHeaders: \nRows: h"),
+        (b"", ""),
+        (
+            b"x\n" + b"\n".join(b"r%d,s" % i for i in range(15)),
+            "CSV:t.csv\nHeaders: x\nRows: " + "; ".join(f"r{i}; s" for i in range(10)),
+        ),
+    ],
+)
+def test_extract_text_csv(helpers, raw, expected):
+    stream = io.BytesIO(raw)
+    assert helpers["_extract_text_csv"](stream, "t.csv") == expected
+    assert not stream.closed  # the upload stays usable after extraction